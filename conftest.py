@@ -0,0 +1,10 @@
+"""Root conftest so the tests can import ``converter`` without installing it."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolate_cache(tmp_path, monkeypatch):
+    """Keep every test away from the user's real on-disk caches."""
+    monkeypatch.setenv("SEINFELD_TV_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("SEINFELD_TV_META_CACHE_DISABLE", "1")
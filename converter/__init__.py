@@ -0,0 +1,6 @@
+"""Converters that package media for the Seinfeld TV player.
+
+Each packager takes ordinary media files (movies, music, music videos)
+and produces the player's on-card layout: MJPEG AVI video, ``.sdb``
+binary metadata and RGB565 ``.raw`` thumbnails.
+"""
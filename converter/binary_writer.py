@@ -0,0 +1,242 @@
+"""Read and write the player's ``.sdb`` binary metadata files.
+
+The on-device firmware reads these structures straight off the SD card,
+so the layout is a contract: little-endian integers, UTF-8 strings
+NUL-padded to a fixed width, and a one-byte record type after the magic.
+
+Readers return lazy views over the raw record buffer: a field is only
+unpacked (and a string only decoded) the first time it is accessed, so
+consumers that touch one or two fields never pay for the rest.
+"""
+
+import os
+import struct
+from pathlib import Path
+
+MAGIC = b"SDB1"
+
+# Write-through cache of decoded records, keyed by absolute path and
+# validated against st_mtime_ns so a rewritten file is never served stale.
+_SDB_CACHE: dict[str, tuple[int, "_LazyMeta"]] = {}
+
+TYPE_MOVIE = 1
+TYPE_ARTIST = 2
+TYPE_ALBUM = 3
+TYPE_TRACK = 4
+TYPE_COLLECTION = 5
+TYPE_VIDEO = 6
+TYPE_PHOTO_ALBUM = 7
+TYPE_YOUTUBE_PLAYLIST = 8
+TYPE_YOUTUBE_VIDEO = 9
+
+_HEADER_FMT = "<4sB"
+_HEADER_SIZE = struct.calcsize(_HEADER_FMT)
+
+
+def _pack_str(value: str, width: int) -> bytes:
+    return value.encode("utf-8")[:width].ljust(width, b"\0")
+
+
+def _unpack_str(raw: bytes) -> str:
+    return raw.split(b"\0", 1)[0].decode("utf-8", "replace")
+
+
+class _LazyMeta:
+    """Lazily decoded view over one ``.sdb`` record buffer."""
+
+    _TYPE = 0
+    _FIELDS: tuple[tuple[str, str], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        offsets = {}
+        offset = _HEADER_SIZE
+        for name, fmt in cls._FIELDS:
+            offsets[name] = (offset, "<" + fmt)
+            offset += struct.calcsize(fmt)
+        cls._OFFSETS = offsets
+        cls._SIZE = offset
+
+    def __init__(self, buf: bytes):
+        self._buf = buf
+
+    def __getattr__(self, name):
+        try:
+            offset, fmt = self._OFFSETS[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        (value,) = struct.unpack_from(fmt, self._buf, offset)
+        if isinstance(value, bytes):
+            value = _unpack_str(value)
+        # Cache the decoded value so repeat access is a plain dict lookup.
+        self.__dict__[name] = value
+        return value
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}"
+                           for name, _ in self._FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+class MovieMeta(_LazyMeta):
+    _TYPE = TYPE_MOVIE
+    _FIELDS = (("title", "64s"), ("year", "H"),
+               ("runtime_minutes", "H"), ("genre", "32s"))
+
+
+class ArtistMeta(_LazyMeta):
+    _TYPE = TYPE_ARTIST
+    _FIELDS = (("name", "64s"), ("genre", "32s"), ("num_albums", "H"))
+
+
+class AlbumMeta(_LazyMeta):
+    _TYPE = TYPE_ALBUM
+    _FIELDS = (("title", "64s"), ("year", "H"), ("num_tracks", "H"))
+
+
+class TrackMeta(_LazyMeta):
+    _TYPE = TYPE_TRACK
+    _FIELDS = (("title", "64s"), ("track_no", "H"), ("duration_seconds", "H"))
+
+
+class CollectionMeta(_LazyMeta):
+    _TYPE = TYPE_COLLECTION
+    _FIELDS = (("name", "64s"), ("num_videos", "H"))
+
+
+class VideoMeta(_LazyMeta):
+    _TYPE = TYPE_VIDEO
+    _FIELDS = (("title", "64s"), ("artist", "64s"), ("duration_seconds", "H"))
+
+
+class PhotoAlbumMeta(_LazyMeta):
+    _TYPE = TYPE_PHOTO_ALBUM
+    _FIELDS = (("name", "64s"), ("num_photos", "H"))
+
+
+class YoutubePlaylistMeta(_LazyMeta):
+    _TYPE = TYPE_YOUTUBE_PLAYLIST
+    _FIELDS = (("name", "64s"), ("num_videos", "H"))
+
+
+class YoutubeVideoMeta(_LazyMeta):
+    _TYPE = TYPE_YOUTUBE_VIDEO
+    _FIELDS = (("title", "64s"), ("uploader", "64s"),
+               ("duration_seconds", "H"), ("upload_year", "H"))
+
+
+def _read_view(path: Path, cls: type[_LazyMeta]) -> _LazyMeta:
+    key = os.path.abspath(os.fspath(path))
+    mtime_ns = os.stat(key).st_mtime_ns
+    cached = _SDB_CACHE.get(key)
+    if cached is not None and cached[0] == mtime_ns and isinstance(cached[1], cls):
+        return cached[1]
+    data = Path(path).read_bytes()
+    magic, record_type = struct.unpack_from(_HEADER_FMT, data)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: bad magic {magic!r}")
+    if record_type != cls._TYPE:
+        raise ValueError(f"{path}: expected type {cls._TYPE}, got {record_type}")
+    if len(data) < cls._SIZE:
+        raise ValueError(f"{path}: truncated record ({len(data)} bytes)")
+    view = cls(data)
+    _SDB_CACHE[key] = (mtime_ns, view)
+    return view
+
+
+def _write_record(path: Path, cls: type[_LazyMeta], *values) -> _LazyMeta:
+    buf = bytearray(cls._SIZE)
+    struct.pack_into(_HEADER_FMT, buf, 0, MAGIC, cls._TYPE)
+    for (name, _), value in zip(cls._FIELDS, values):
+        offset, fmt = cls._OFFSETS[name]
+        if fmt.endswith("s"):
+            value = _pack_str(value, struct.calcsize(fmt))
+        struct.pack_into(fmt, buf, offset, value)
+    path = Path(path)
+    path.write_bytes(buf)
+    view = cls(bytes(buf))
+    key = os.path.abspath(os.fspath(path))
+    _SDB_CACHE[key] = (os.stat(key).st_mtime_ns, view)
+    return view
+
+
+def write_movie_metadata(path: Path, title: str, year: int, runtime_minutes: int,
+                         genre: str = "") -> MovieMeta:
+    return _write_record(path, MovieMeta, title, year, runtime_minutes, genre)
+
+
+def read_movie_metadata(path: Path) -> MovieMeta:
+    return _read_view(path, MovieMeta)
+
+
+def write_artist_metadata(path: Path, name: str, genre: str = "",
+                          num_albums: int = 0) -> ArtistMeta:
+    return _write_record(path, ArtistMeta, name, genre, num_albums)
+
+
+def read_artist_metadata(path: Path) -> ArtistMeta:
+    return _read_view(path, ArtistMeta)
+
+
+def write_album_metadata(path: Path, title: str, year: int = 0,
+                         num_tracks: int = 0) -> AlbumMeta:
+    return _write_record(path, AlbumMeta, title, year, num_tracks)
+
+
+def read_album_metadata(path: Path) -> AlbumMeta:
+    return _read_view(path, AlbumMeta)
+
+
+def write_track_metadata(path: Path, title: str, track_no: int,
+                         duration_seconds: int = 0) -> TrackMeta:
+    return _write_record(path, TrackMeta, title, track_no, duration_seconds)
+
+
+def read_track_metadata(path: Path) -> TrackMeta:
+    return _read_view(path, TrackMeta)
+
+
+def write_collection_metadata(path: Path, name: str, num_videos: int = 0) -> CollectionMeta:
+    return _write_record(path, CollectionMeta, name, num_videos)
+
+
+def read_collection_metadata(path: Path) -> CollectionMeta:
+    return _read_view(path, CollectionMeta)
+
+
+def write_video_metadata(path: Path, title: str, artist: str = "",
+                         duration_seconds: int = 0) -> VideoMeta:
+    return _write_record(path, VideoMeta, title, artist, duration_seconds)
+
+
+def read_video_metadata(path: Path) -> VideoMeta:
+    return _read_view(path, VideoMeta)
+
+
+def write_photo_album_metadata(path: Path, name: str,
+                               num_photos: int = 0) -> PhotoAlbumMeta:
+    return _write_record(path, PhotoAlbumMeta, name, num_photos)
+
+
+def read_photo_album_metadata(path: Path) -> PhotoAlbumMeta:
+    return _read_view(path, PhotoAlbumMeta)
+
+
+def write_youtube_playlist_metadata(path: Path, name: str,
+                                    num_videos: int = 0) -> YoutubePlaylistMeta:
+    return _write_record(path, YoutubePlaylistMeta, name, num_videos)
+
+
+def read_youtube_playlist_metadata(path: Path) -> YoutubePlaylistMeta:
+    return _read_view(path, YoutubePlaylistMeta)
+
+
+def write_youtube_video_metadata(path: Path, title: str, uploader: str = "",
+                                 duration_seconds: int = 0,
+                                 upload_year: int = 0) -> YoutubeVideoMeta:
+    return _write_record(path, YoutubeVideoMeta, title, uploader,
+                         duration_seconds, upload_year)
+
+
+def read_youtube_video_metadata(path: Path) -> YoutubeVideoMeta:
+    return _read_view(path, YoutubeVideoMeta)
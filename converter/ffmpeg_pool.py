@@ -0,0 +1,89 @@
+"""Run many short ffmpeg jobs through a small worker pool.
+
+ffmpeg's fixed startup cost (process spawn, codec registration) rivals
+the actual encode time of a short still-image MJPEG track.  One warm
+ffmpeg process cannot be handed new output files over stdin, so the
+pool amortises the fixed cost the next best way: a few worker threads
+keep several ffmpeg processes in flight at once, overlapping every
+spawn with another worker's encode.
+"""
+
+import logging
+import queue
+import subprocess
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+
+
+class FFmpegPool:
+    """Bounded pool that runs ffmpeg argument lists on worker threads."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS):
+        self._queue: queue.Queue = queue.Queue()
+        self._failures: list[str] = []
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._worker, daemon=True,
+                             name=f"ffmpeg-pool-{n}")
+            for n in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, cmd: list[str], timeout: float = 600) -> None:
+        """Queue one ffmpeg command for execution."""
+        self._queue.put((cmd, timeout))
+
+    def wait(self) -> bool:
+        """Block until all queued jobs finished; True if none failed."""
+        self._queue.join()
+        with self._lock:
+            return not self._failures
+
+    @property
+    def failures(self) -> list[str]:
+        with self._lock:
+            return list(self._failures)
+
+    def close(self) -> None:
+        """Wait for queued jobs and stop the workers."""
+        self._queue.join()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                cmd, timeout = item
+                self._run_one(cmd, timeout)
+            finally:
+                self._queue.task_done()
+
+    def _run_one(self, cmd: list[str], timeout: float) -> None:
+        try:
+            result = subprocess.run(cmd, capture_output=True, timeout=timeout)
+        except (subprocess.TimeoutExpired, OSError) as exc:
+            self._record_failure(cmd, str(exc))
+            return
+        if result.returncode != 0:
+            self._record_failure(cmd, f"exit {result.returncode}")
+
+    def _record_failure(self, cmd: list[str], reason: str) -> None:
+        target = cmd[-1] if cmd else "?"
+        logger.error("pooled ffmpeg job for %s failed: %s", target, reason)
+        with self._lock:
+            self._failures.append(target)
@@ -0,0 +1,68 @@
+"""Persistent on-disk cache for fetched metadata.
+
+One JSON file per key under ``~/.cache/seinfeld_tv/meta/`` (or
+``$SEINFELD_TV_CACHE_DIR/meta/``), so re-runs and retries of a batch
+package skip the network entirely.  Set
+``SEINFELD_TV_META_CACHE_DISABLE=1`` to bypass the cache, e.g. in tests.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def _enabled() -> bool:
+    return os.environ.get("SEINFELD_TV_META_CACHE_DISABLE") != "1"
+
+
+def _cache_dir() -> Path:
+    root = os.environ.get("SEINFELD_TV_CACHE_DIR")
+    base = Path(root) if root else Path.home() / ".cache" / "seinfeld_tv"
+    return base / "meta"
+
+
+def make_key(kind: str, title: str, year: int | None = None) -> str:
+    """Stable cache key for a (kind, title, year) lookup."""
+    return hashlib.sha1(f"{kind}:{title}:{year}".encode()).hexdigest()
+
+
+def get(key: str, max_age: float | None = None) -> dict | None:
+    """Return the cached dict for *key*, or None on miss or disabled cache.
+
+    With *max_age* (seconds), entries written longer ago than that are
+    treated as misses — used for data that goes stale, like video
+    listings.
+    """
+    if not _enabled():
+        return None
+    path = _cache_dir() / f"{key}.json"
+    try:
+        if max_age is not None and time.time() - path.stat().st_mtime > max_age:
+            return None
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning("discarding unreadable cache entry %s: %s", path, exc)
+        return None
+
+
+def put(key: str, value: dict) -> None:
+    """Store *value* under *key*; failures are logged, never raised."""
+    if not _enabled():
+        return
+    try:
+        directory = _cache_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so a reader (or a crash) never sees a
+        # half-written entry.
+        tmp = directory / f"{key}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(value))
+        tmp.replace(directory / f"{key}.json")
+    except OSError as exc:
+        logger.warning("could not write cache entry %s: %s", key, exc)
@@ -0,0 +1,92 @@
+"""Look up descriptive metadata for movies and music.
+
+Uses the iTunes Search API, which needs no key.  Lookups degrade
+gracefully: on any network or parse error the fetcher returns a minimal
+dict built from the caller's own information, so packaging never fails
+just because metadata is unavailable.
+"""
+
+import logging
+
+import requests
+
+from . import meta_cache
+
+logger = logging.getLogger(__name__)
+
+SEARCH_URL = "https://itunes.apple.com/search"
+
+
+class MetadataFetcher:
+    """Fetches movie / artist / album metadata from the iTunes Search API."""
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+
+    def fetch_movie(self, title: str, year: int | None = None) -> dict:
+        key = meta_cache.make_key("movie", title, year)
+        cached = meta_cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._search({"term": title, "media": "movie", "entity": "movie",
+                               "limit": 1})
+        if result:
+            meta = {
+                "title": result.get("trackName", title),
+                "year": _year_of(result.get("releaseDate", "")) or year or 0,
+                "runtime_minutes": int(result.get("trackTimeMillis", 0)) // 60000,
+                "genre": result.get("primaryGenreName", ""),
+            }
+            meta_cache.put(key, meta)
+            return meta
+        return {"title": title, "year": year or 0, "runtime_minutes": 0, "genre": ""}
+
+    def fetch_artist(self, name: str) -> dict:
+        key = meta_cache.make_key("artist", name)
+        cached = meta_cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._search({"term": name, "media": "music",
+                               "entity": "musicArtist", "limit": 1})
+        if result:
+            meta = {
+                "name": result.get("artistName", name),
+                "genre": result.get("primaryGenreName", ""),
+            }
+            meta_cache.put(key, meta)
+            return meta
+        return {"name": name, "genre": ""}
+
+    def fetch_album(self, artist: str, title: str) -> dict:
+        key = meta_cache.make_key("album", f"{artist}:{title}")
+        cached = meta_cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._search({"term": f"{artist} {title}", "media": "music",
+                               "entity": "album", "limit": 1})
+        if result:
+            meta = {
+                "title": result.get("collectionName", title),
+                "year": _year_of(result.get("releaseDate", "")),
+                "num_tracks": int(result.get("trackCount", 0)),
+            }
+            meta_cache.put(key, meta)
+            return meta
+        return {"title": title, "year": 0, "num_tracks": 0}
+
+    def _search(self, params: dict) -> dict | None:
+        try:
+            response = requests.get(SEARCH_URL, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            results = response.json().get("results", [])
+            return results[0] if results else None
+        except (requests.RequestException, ValueError) as exc:
+            logger.warning("metadata lookup failed for %r: %s", params.get("term"), exc)
+            return None
+
+
+def _year_of(release_date: str) -> int:
+    try:
+        return int(release_date[:4])
+    except ValueError:
+        return 0
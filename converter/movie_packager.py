@@ -0,0 +1,84 @@
+"""Package a movie file for the player.
+
+Produces, per movie:
+
+    <output>/<Sanitized_Title>/
+        movie.avi   210x135 MJPEG video with 8-bit mono PCM audio
+        movie.sdb   binary metadata (see binary_writer)
+        movie.raw   108x67 RGB565 menu thumbnail
+"""
+
+import logging
+import re
+import subprocess
+from pathlib import Path
+
+from .binary_writer import write_movie_metadata
+from .metadata_fetcher import MetadataFetcher
+from .thumbnail_generator import generate_thumbnail
+
+logger = logging.getLogger(__name__)
+
+TARGET_WIDTH = 210
+TARGET_HEIGHT = 135
+
+# Separator characters map to "_"; decorative characters are dropped outright.
+_SANITIZE_TABLE = str.maketrans(
+    {c: "_" for c in " -:;,./\\"} | {c: "" for c in "!?'\"&()[]{}"}
+)
+_RE_MULTI_UNDERSCORE = re.compile(r"_+")
+_MAX_NAME_LEN = 31
+_FALLBACK_NAME = "Unknown"
+
+
+def sanitize_name(name: str) -> str:
+    """Turn *name* into a short, filesystem-safe directory name."""
+    s = name.translate(_SANITIZE_TABLE)
+    s = _RE_MULTI_UNDERSCORE.sub("_", s).strip("_")
+    if len(s) > _MAX_NAME_LEN:
+        s = s[:_MAX_NAME_LEN].rstrip("_")
+    return s or _FALLBACK_NAME
+
+
+def convert_movie(input_path: Path, output_path: Path, fps: int = 24,
+                  quality: int = 7) -> bool:
+    """Convert *input_path* to the player's MJPEG AVI format."""
+    cmd = [
+        "ffmpeg", "-y", "-i", str(input_path),
+        "-vf", f"scale={TARGET_WIDTH}:{TARGET_HEIGHT}:force_original_aspect_ratio=decrease,"
+               f"pad={TARGET_WIDTH}:{TARGET_HEIGHT}:(ow-iw)/2:(oh-ih)/2",
+        "-r", str(fps), "-c:v", "mjpeg", "-q:v", str(quality),
+        "-c:a", "pcm_u8", "-ar", "11025", "-ac", "1",
+        str(output_path),
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=3600)
+    except (subprocess.TimeoutExpired, OSError) as exc:
+        logger.error("ffmpeg failed for %s: %s", input_path, exc)
+        return False
+    if result.returncode != 0:
+        logger.error("ffmpeg exited %d for %s", result.returncode, input_path)
+        return False
+    return True
+
+
+def package_movie(input_path: Path, output_dir: Path,
+                  fetcher: MetadataFetcher | None = None,
+                  fps: int = 24, quality: int = 7) -> bool:
+    """Convert one movie and write its metadata and thumbnail."""
+    fetcher = fetcher or MetadataFetcher()
+    meta = fetcher.fetch_movie(input_path.stem)
+    movie_dir = output_dir / sanitize_name(meta["title"])
+    movie_dir.mkdir(parents=True, exist_ok=True)
+    if not convert_movie(input_path, movie_dir / "movie.avi", fps=fps, quality=quality):
+        return False
+    write_movie_metadata(
+        movie_dir / "movie.sdb",
+        title=meta["title"],
+        year=meta.get("year", 0),
+        runtime_minutes=meta.get("runtime_minutes", 0),
+        genre=meta.get("genre", ""),
+    )
+    generate_thumbnail(movie_dir / "movie.raw", video_path=input_path,
+                       text=meta["title"])
+    return True
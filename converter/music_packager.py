@@ -0,0 +1,223 @@
+"""Package an artist's music library for the player.
+
+Expects ``<artist>/<album>/<tracks>`` on the input side and produces:
+
+    <output>/<Artist_Name>/
+        artist.sdb  artist.raw
+        A01/
+            album.sdb  album.raw
+            cover.jpg           (copied art, when present)
+            T01.avi  T01.sdb  ...
+
+Each track becomes a still-image MJPEG AVI (album art or a black frame)
+with the audio as 8-bit mono PCM, which is all the player can decode.
+"""
+
+import atexit
+import functools
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from .binary_writer import (
+    write_album_metadata,
+    write_artist_metadata,
+    write_track_metadata,
+)
+from .ffmpeg_pool import FFmpegPool
+from .metadata_fetcher import MetadataFetcher
+from .thumbnail_generator import generate_thumbnail
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = frozenset({".mp3", ".flac", ".ogg", ".wav", ".m4a"})
+
+# Fixed ffmpeg argv fragments, encoded once so each process launch only
+# fsencodes the paths that actually vary per track.
+_FFMPEG_STATIC_HEAD = (b"ffmpeg", b"-y", b"-loop", b"1")
+_FFMPEG_STATIC_TAIL = (b"-c:v", b"mjpeg", b"-c:a", b"pcm_u8", b"-ar", b"11025",
+                       b"-ac", b"1", b"-shortest")
+_AUDIO_SUFFIXES = tuple(AUDIO_EXTENSIONS)
+ART_PRIORITY = ("cover.jpg", "cover.png", "folder.jpg")
+
+# Separator characters map to "_"; decorative characters are dropped outright.
+_SANITIZE_TABLE = str.maketrans(
+    {c: "_" for c in " -:;,./\\"} | {c: "" for c in "!?'\"&()[]{}"}
+)
+_RE_MULTI_UNDERSCORE = re.compile(r"_+")
+_MAX_NAME_LEN = 31
+_FALLBACK_NAME = "Unknown"
+
+
+def sanitize_name(name: str) -> str:
+    """Turn *name* into a short, filesystem-safe directory name."""
+    s = name.translate(_SANITIZE_TABLE)
+    s = _RE_MULTI_UNDERSCORE.sub("_", s).strip("_")
+    if len(s) > _MAX_NAME_LEN:
+        s = s[:_MAX_NAME_LEN].rstrip("_")
+    return s or _FALLBACK_NAME
+
+
+@dataclass(slots=True)
+class _TrackEntry:
+    """Everything the per-track loops need, computed once per album."""
+
+    src: Path
+    out_name: str   # "T01.avi"
+    sdb_name: str   # "T01.sdb"
+    title: str      # source file stem
+    track_no: int
+
+
+@functools.lru_cache(maxsize=1)
+def _black_placeholder_path() -> Path:
+    """Write the black art frame used for art-less tracks, once per run."""
+    # Imported here so merely loading the packager (CLI --help, test
+    # collection) does not pay Pillow's import cost.
+    from PIL import Image
+
+    path = Path(tempfile.gettempdir()) / "_seinfeld_black.png"
+    if not path.exists():
+        Image.new("RGB", (16, 16), (0, 0, 0)).save(path)
+    atexit.register(lambda: path.unlink(missing_ok=True))
+    return path
+
+
+def convert_audio_to_avi(audio_path: Path | str, output_path: Path | str,
+                         art_path: Path | str | None = None, fps: int = 1,
+                         pool: FFmpegPool | None = None) -> bool:
+    """Mux *audio_path* under a still image into the player's AVI format.
+
+    With *pool* given, the job is queued on the pool and judged by the
+    caller via ``pool.wait()``; otherwise ffmpeg runs synchronously.
+
+    Re-runs are idempotent: an existing, non-empty output at least as
+    new as the source is kept as-is.
+    """
+    try:
+        out_stat = os.stat(output_path)
+        if out_stat.st_size > 0 and out_stat.st_mtime >= os.stat(audio_path).st_mtime:
+            logger.debug("keeping up-to-date %s", output_path)
+            return True
+    except FileNotFoundError:
+        pass
+    if art_path is None:
+        art_path = _black_placeholder_path()
+    cmd = [
+        *_FFMPEG_STATIC_HEAD, b"-i", os.fsencode(art_path),
+        b"-i", os.fsencode(audio_path),
+        *_FFMPEG_STATIC_TAIL, b"-r", str(fps).encode(),
+        os.fsencode(output_path),
+    ]
+    if pool is not None:
+        pool.submit(cmd)
+        return True
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=600)
+    except (subprocess.TimeoutExpired, OSError) as exc:
+        logger.error("ffmpeg failed for %s: %s", audio_path, exc)
+        return False
+    if result.returncode != 0:
+        logger.error("ffmpeg exited %d for %s", result.returncode, audio_path)
+        return False
+    try:
+        out_stat = os.stat(output_path)
+    except FileNotFoundError:
+        out_stat = None
+    if out_stat is None or out_stat.st_size == 0:
+        logger.error("ffmpeg produced no output for %s", audio_path)
+        return False
+    logger.info("wrote %s (%d bytes)", output_path, out_stat.st_size)
+    return True
+
+
+def _copy_art(src: Path, dst: Path) -> None:
+    """Copy an art file, in-kernel via copy_file_range where available."""
+    try:
+        with open(src, "rb") as source, open(dst, "wb") as dest:
+            remaining = os.fstat(source.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(source.fileno(), dest.fileno(),
+                                            remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except (AttributeError, OSError):
+        shutil.copyfile(src, dst)
+
+
+def package_music(input_dir: Path, output_dir: Path,
+                  fetcher: MetadataFetcher | None = None) -> bool:
+    """Package every album under *input_dir* (one artist) for the player."""
+    fetcher = fetcher or MetadataFetcher()
+    artist_name = input_dir.name
+    artist_info = fetcher.fetch_artist(artist_name)
+    artist_dir = output_dir / sanitize_name(artist_name)
+    artist_dir.mkdir(parents=True, exist_ok=True)
+    artist_dir_s = str(artist_dir)
+
+    album_dirs = sorted(p for p in input_dir.iterdir() if p.is_dir())
+    first_art = None
+    for album_no, album_path in enumerate(album_dirs, start=1):
+        # One scandir pass collects audio files and art candidates together.
+        audio_files = []
+        art_candidates = {}
+        with os.scandir(album_path) as entries:
+            for entry in entries:
+                lower = entry.name.lower()
+                if lower.endswith(_AUDIO_SUFFIXES):
+                    audio_files.append(Path(entry.path))
+                elif lower in ART_PRIORITY:
+                    art_candidates[lower] = Path(entry.path)
+        audio_files.sort()
+        entries = [
+            _TrackEntry(src=path, out_name=f"T{no:02d}.avi",
+                        sdb_name=f"T{no:02d}.sdb", title=path.stem, track_no=no)
+            for no, path in enumerate(audio_files, start=1)
+        ]
+        art_path = next((art_candidates[name] for name in ART_PRIORITY
+                         if name in art_candidates), None)
+
+        album_dir = artist_dir / f"A{album_no:02d}"
+        album_dir.mkdir(exist_ok=True)
+        # Plain string joins inside the per-track section: each "/" on a
+        # Path allocates a new Path object, which adds up over a library.
+        album_dir_s = os.path.join(artist_dir_s, f"A{album_no:02d}")
+        album_info = fetcher.fetch_album(artist_name, album_path.name)
+        write_album_metadata(
+            os.path.join(album_dir_s, "album.sdb"),
+            title=album_info["title"],
+            year=album_info.get("year", 0),
+            num_tracks=len(audio_files),
+        )
+        if art_path is not None:
+            _copy_art(art_path, album_dir / ("cover" + art_path.suffix.lower()))
+            if first_art is None:
+                first_art = art_path
+
+        for entry in entries:
+            if not convert_audio_to_avi(entry.src,
+                                        os.path.join(album_dir_s, entry.out_name),
+                                        art_path):
+                logger.warning("skipping %s", entry.src)
+                continue
+            write_track_metadata(os.path.join(album_dir_s, entry.sdb_name),
+                                 title=entry.title, track_no=entry.track_no)
+
+        generate_thumbnail(album_dir / "album.raw", image_path=art_path,
+                           text=album_path.name)
+
+    write_artist_metadata(
+        artist_dir / "artist.sdb",
+        name=artist_name,
+        genre=artist_info.get("genre", ""),
+        num_albums=len(album_dirs),
+    )
+    generate_thumbnail(artist_dir / "artist.raw", image_path=first_art,
+                       text=artist_name)
+    return True
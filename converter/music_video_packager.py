@@ -0,0 +1,102 @@
+"""Package a directory of music videos into one player collection.
+
+Produces:
+
+    <output>/<Collection_Name>/
+        collection.sdb  collection.raw
+        V01.avi  V01.sdb  V01.raw  ...
+
+Videos are numbered in alphabetical filename order.
+"""
+
+import logging
+import operator
+import os
+import re
+import subprocess
+from pathlib import Path
+
+from .binary_writer import write_collection_metadata, write_video_metadata
+from .thumbnail_generator import batch_generate_thumbnails
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = frozenset({".mp4", ".mkv", ".webm"})
+_VIDEO_SUFFIXES = tuple(VIDEO_EXTENSIONS)
+
+TARGET_WIDTH = 210
+TARGET_HEIGHT = 135
+
+# Separator characters map to "_"; decorative characters are dropped outright.
+_SANITIZE_TABLE = str.maketrans(
+    {c: "_" for c in " -:;,./\\"} | {c: "" for c in "!?'\"&()[]{}"}
+)
+_RE_MULTI_UNDERSCORE = re.compile(r"_+")
+_MAX_NAME_LEN = 31
+_FALLBACK_NAME = "Unknown"
+
+
+def sanitize_name(name: str) -> str:
+    """Turn *name* into a short, filesystem-safe directory name."""
+    s = name.translate(_SANITIZE_TABLE)
+    s = _RE_MULTI_UNDERSCORE.sub("_", s).strip("_")
+    if len(s) > _MAX_NAME_LEN:
+        s = s[:_MAX_NAME_LEN].rstrip("_")
+    return s or _FALLBACK_NAME
+
+
+def convert_video_to_avi(input_path: Path, output_path: Path, fps: int = 10,
+                         quality: int = 7) -> bool:
+    """Convert *input_path* to the player's MJPEG AVI format."""
+    cmd = [
+        "ffmpeg", "-y", "-i", str(input_path),
+        "-vf", f"scale={TARGET_WIDTH}:{TARGET_HEIGHT}:force_original_aspect_ratio=decrease,"
+               f"pad={TARGET_WIDTH}:{TARGET_HEIGHT}:(ow-iw)/2:(oh-ih)/2",
+        "-r", str(fps), "-c:v", "mjpeg", "-q:v", str(quality),
+        "-c:a", "pcm_u8", "-ar", "11025", "-ac", "1",
+        str(output_path),
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=3600)
+    except (subprocess.TimeoutExpired, OSError) as exc:
+        logger.error("ffmpeg failed for %s: %s", input_path, exc)
+        return False
+    if result.returncode != 0:
+        logger.error("ffmpeg exited %d for %s", result.returncode, input_path)
+        return False
+    return True
+
+
+def package_music_videos(input_dir: Path, output_dir: Path, fps: int = 10,
+                         quality: int = 7) -> bool:
+    """Package every video in *input_dir* into one collection."""
+    # Sort the raw directory entries by name and only then build Paths,
+    # so non-matching entries never become Path objects at all.
+    with os.scandir(input_dir) as entries:
+        matches = [entry for entry in entries
+                   if entry.is_file() and entry.name.lower().endswith(_VIDEO_SUFFIXES)]
+    matches.sort(key=operator.attrgetter("name"))
+    videos = [Path(entry.path) for entry in matches]
+    if not videos:
+        logger.warning("no videos found in %s", input_dir)
+        return False
+
+    collection_dir = output_dir / sanitize_name(input_dir.name)
+    collection_dir.mkdir(parents=True, exist_ok=True)
+
+    thumbnail_jobs = []
+    for video_no, video in enumerate(videos, start=1):
+        output = collection_dir / f"V{video_no:02d}.avi"
+        if not convert_video_to_avi(video, output, fps=fps, quality=quality):
+            logger.warning("skipping %s", video)
+            continue
+        write_video_metadata(collection_dir / f"V{video_no:02d}.sdb",
+                             title=video.stem)
+        thumbnail_jobs.append((video, collection_dir / f"V{video_no:02d}.raw"))
+
+    write_collection_metadata(collection_dir / "collection.sdb",
+                              name=input_dir.name, num_videos=len(videos))
+    thumbnail_jobs.append((videos[0], collection_dir / "collection.raw"))
+    # One ffmpeg invocation grabs the frames for every thumbnail at once.
+    batch_generate_thumbnails(thumbnail_jobs)
+    return True
@@ -0,0 +1,164 @@
+"""Package a directory of photos into one player album.
+
+Produces:
+
+    <output>/<Album_Name>/
+        album.sdb  album.raw
+        P01.raw  P02.raw  ...
+
+Each photo is cover-cropped to the full 210x135 screen and written as
+big-endian RGB565, the framebuffer format the player blits directly.
+"""
+
+import logging
+import os
+import re
+import string
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from .binary_writer import write_photo_album_metadata
+from .thumbnail_generator import generate_thumbnail, generate_thumbnail_from_image
+
+logger = logging.getLogger(__name__)
+
+PHOTO_WIDTH = 210
+PHOTO_HEIGHT = 135
+RAW_SIZE = PHOTO_WIDTH * PHOTO_HEIGHT * 2
+
+PHOTO_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".bmp"})
+
+# Per-thread scratch buffers reused across photos, so packing an album
+# allocates two frames total instead of two per photo.
+_scratch = threading.local()
+
+
+def _pack_buffers() -> tuple[np.ndarray, np.ndarray]:
+    try:
+        return _scratch.rgb, _scratch.rgb565
+    except AttributeError:
+        _scratch.rgb = np.empty((PHOTO_HEIGHT, PHOTO_WIDTH, 3), dtype=np.uint8)
+        _scratch.rgb565 = np.empty((PHOTO_HEIGHT, PHOTO_WIDTH), dtype=">u2")
+        return _scratch.rgb, _scratch.rgb565
+
+
+# Everything outside [A-Za-z0-9_] maps to "_" in one C-level pass.
+_ALLOWED = frozenset(string.ascii_letters + string.digits + "_")
+_SANITIZE_TABLE = str.maketrans(
+    {c: "_" for c in map(chr, range(256)) if c not in _ALLOWED}
+)
+_RE_MULTI_UNDERSCORE = re.compile(r"_+")
+
+
+def sanitize_name(name: str) -> str:
+    """Turn *name* into a short, filesystem-safe directory name."""
+    s = _RE_MULTI_UNDERSCORE.sub("_", name.translate(_SANITIZE_TABLE)).strip("_")
+    if len(s) > 31:
+        s = s[:31].rstrip("_")
+    return s or "Album"
+
+
+def _cover_crop(img: Image.Image) -> Image.Image:
+    """Scale *img* to fill the screen, then centre-crop the overflow."""
+    if img.size == (PHOTO_WIDTH, PHOTO_HEIGHT):
+        # Already framebuffer-sized (e.g. normalized upstream): skip
+        # the resampler and its per-size coefficient setup entirely.
+        return img
+    scale = max(PHOTO_WIDTH / img.width, PHOTO_HEIGHT / img.height)
+    # BILINEAR is indistinguishable from LANCZOS at 210x135 and is the
+    # fast path under pillow-simd's AVX2 resampler.
+    img = img.resize((round(img.width * scale), round(img.height * scale)),
+                     Image.Resampling.BILINEAR)
+    if img.size == (PHOTO_WIDTH, PHOTO_HEIGHT):
+        return img
+    left = (img.width - PHOTO_WIDTH) // 2
+    top = (img.height - PHOTO_HEIGHT) // 2
+    return img.crop((left, top, left + PHOTO_WIDTH, top + PHOTO_HEIGHT))
+
+
+def _open_rgb(input_path: Path) -> Image.Image | None:
+    try:
+        img = Image.open(input_path)
+        # For JPEGs this decodes at reduced resolution via DCT
+        # truncation; 2x the target leaves the resampler enough pixels.
+        # Other formats ignore it.
+        img.draft("RGB", (PHOTO_WIDTH * 2, PHOTO_HEIGHT * 2))
+        return img.convert("RGB") if img.mode != "RGB" else img
+    except OSError as exc:
+        logger.warning("could not open %s: %s", input_path, exc)
+        return None
+
+
+def convert_photo_to_raw(input_path: Path, output_path: Path) -> bool:
+    """Write *input_path* as a full-screen RGB565 ``.raw`` photo."""
+    img = _open_rgb(input_path)
+    if img is None:
+        return False
+    _write_cropped_raw(img, output_path)
+    return True
+
+
+def _write_cropped_raw(img: Image.Image, output_path: Path) -> None:
+    img = _cover_crop(img)
+    rgb, rgb565 = _pack_buffers()
+    np.copyto(rgb, np.asarray(img))
+    np.copyto(rgb565,
+              ((rgb[..., 0].astype(np.uint16) & 0xF8) << 8)
+              | ((rgb[..., 1].astype(np.uint16) & 0xFC) << 3)
+              | (rgb[..., 2] >> 3))
+    # tofile writes the array buffer straight out; write_bytes would
+    # first copy it into an intermediate bytes object.
+    with open(output_path, "wb") as f:
+        rgb565.tofile(f)
+
+
+def _convert_one(task: tuple[Path, Path]) -> bool:
+    """Process-pool entry point: convert one ``(src, dst_raw)`` pair."""
+    src, dst = task
+    return convert_photo_to_raw(src, dst)
+
+
+def package_photos(input_dir: Path, output_dir: Path) -> bool:
+    """Package every photo in *input_dir* into one album.
+
+    Photos are independent (decode, resize, pack, write), so they are
+    converted across a process pool; the album metadata and thumbnail
+    are written once every worker has finished.
+    """
+    photos = sorted(p for p in input_dir.iterdir()
+                    if p.is_file() and p.suffix.lower() in PHOTO_EXTENSIONS)
+    if not photos:
+        logger.warning("no photos found in %s", input_dir)
+        return False
+
+    album_dir = output_dir / sanitize_name(input_dir.name)
+    album_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = [(photo, album_dir / f"P{photo_no:02d}.raw")
+             for photo_no, photo in enumerate(photos, start=1)]
+    # The first photo doubles as the album thumbnail; converting it in
+    # this process lets its decode be reused instead of repeated.
+    first_img = _open_rgb(tasks[0][0])
+    if first_img is not None:
+        _write_cropped_raw(first_img, tasks[0][1])
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        results = [first_img is not None]
+        results += pool.map(_convert_one, tasks[1:], chunksize=4)
+    converted = sum(results)
+    for (src, _), ok in zip(tasks, results):
+        if not ok:
+            logger.warning("skipping %s", src)
+
+    write_photo_album_metadata(album_dir / "album.sdb", name=input_dir.name,
+                               num_photos=converted)
+    if first_img is not None:
+        generate_thumbnail_from_image(tasks[0][0], album_dir / "album.raw",
+                                      image_array=np.asarray(first_img))
+    else:
+        generate_thumbnail(album_dir / "album.raw", image_path=photos[0],
+                           text=input_dir.name)
+    return True
@@ -0,0 +1,312 @@
+"""Generate RGB565 thumbnails for the player's on-device menu.
+
+Thumbnails are 108x67 pixels packed as big-endian RGB565 — the raw
+framebuffer format the TFT driver blits directly.
+"""
+
+import functools
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+THUMB_WIDTH = 108
+THUMB_HEIGHT = 67
+
+# Per-channel 256-entry lookup tables: the mask/shift arithmetic is
+# precomputed once, leaving one gather and two ORs per pixel.
+_R565 = (np.arange(256, dtype=np.uint16) >> 3) << 11
+_G565 = (np.arange(256, dtype=np.uint16) >> 2) << 5
+_B565 = np.arange(256, dtype=np.uint16) >> 3
+
+
+def rgb888_to_rgb565(r: int, g: int, b: int) -> int:
+    """Pack one 24-bit RGB pixel into 16-bit RGB565."""
+    return int(_R565[r] | _G565[g] | _B565[b])
+
+
+# Optional numba kernel, compiled on first use; False once numba turned
+# out to be unavailable so we only attempt the import a single time.
+_numba_pack = None
+
+
+def _get_numba_pack():
+    """Return the jitted row-parallel packing kernel, or None."""
+    global _numba_pack
+    if _numba_pack is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _numba_pack = False
+        else:
+            @njit(parallel=True, cache=True, fastmath=True)
+            def _pack(arr, out):
+                # Emits the big-endian byte pair directly, so the caller
+                # needs no byteswapping pass over the packed frame.
+                width = arr.shape[1]
+                for y in prange(arr.shape[0]):
+                    for x in range(width):
+                        value = (
+                            (np.uint16(arr[y, x, 0] & 0xF8) << 8)
+                            | (np.uint16(arr[y, x, 1] & 0xFC) << 3)
+                            | np.uint16(arr[y, x, 2] >> 3)
+                        )
+                        k = (y * width + x) * 2
+                        out[k] = value >> 8
+                        out[k + 1] = value & 0xFF
+
+            _numba_pack = _pack
+    return _numba_pack or None
+
+
+@functools.lru_cache(maxsize=1)
+def _rgb565_rawmode() -> tuple[str, bool] | None:
+    """Probe for a Pillow raw packer that emits RGB565, once per run.
+
+    Returns ``(rawmode, needs_byteswap)``. The result is verified
+    against the three primaries rather than trusted by name — rawmode
+    layouts vary across Pillow builds, and many builds ship no 16-bit
+    packer at all.
+    """
+    probe = Image.new("RGB", (3, 1))
+    probe.putdata([(255, 0, 0), (0, 255, 0), (0, 0, 255)])
+    expected = b"\xf8\x00\x07\xe0\x00\x1f"
+    for rawmode in ("BGR;16", "BGR;16B", "RGB;16"):
+        try:
+            data = probe.tobytes("raw", rawmode)
+        except ValueError:
+            continue
+        if data == expected:
+            return rawmode, False
+        if np.frombuffer(data, "<u2").byteswap().tobytes() == expected:
+            return rawmode, True
+    return None
+
+
+def image_to_rgb565(img: Image.Image) -> bytes:
+    """Convert *img* to big-endian RGB565 bytes, row-major.
+
+    The whole frame is packed in a handful of NumPy array operations
+    instead of a per-pixel Python loop.
+    """
+    # np.asarray reads Pillow's internal buffer directly; convert() (a
+    # full-frame copy) only happens for the odd non-RGB input.
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    packer = _rgb565_rawmode()
+    if packer is not None:
+        # libImaging packs the whole frame in one C pass; at most the
+        # byte order still needs flipping for the display.
+        rawmode, needs_swap = packer
+        data = img.tobytes("raw", rawmode)
+        if needs_swap:
+            return np.frombuffer(data, "<u2").byteswap().tobytes()
+        return data
+    arr = np.asarray(img, dtype=np.uint8)
+    pack = _get_numba_pack()
+    if pack is not None:
+        out = np.empty(arr.shape[0] * arr.shape[1] * 2, dtype=np.uint8)
+        pack(np.ascontiguousarray(arr), out)
+        return out.tobytes()
+    rgb565 = _R565[arr[..., 0]]
+    np.bitwise_or(rgb565, _G565[arr[..., 1]], out=rgb565)
+    np.bitwise_or(rgb565, _B565[arr[..., 2]], out=rgb565)
+    return rgb565.astype(">u2").tobytes()
+
+
+def _write_raw(path: Path, data: bytes) -> None:
+    """One open/write/close round-trip per 14 KB thumbnail."""
+    fd = os.open(os.fspath(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def generate_thumbnail_from_image(image_path: Path | None, output_path: Path,
+                                  image_array: np.ndarray | None = None,
+                                  image: Image.Image | None = None) -> bool:
+    """Letterbox *image_path* into a 108x67 RGB565 thumbnail.
+
+    When the caller already holds the decoded picture, passing it as
+    *image* (a PIL image) or *image_array* (RGB pixels) skips
+    re-opening and re-decoding the file.
+    """
+    if image is not None:
+        img = image
+    elif image_array is not None:
+        img = Image.fromarray(image_array)
+    else:
+        try:
+            img = Image.open(image_path)
+        except OSError as exc:
+            logger.warning("could not open %s: %s", image_path, exc)
+            return False
+    img = img.convert("RGB")
+    # BILINEAR is indistinguishable from LANCZOS at 108x67 and is the
+    # fast path under pillow-simd's AVX2 resampler.
+    # reducing_gap lets Pillow box-downscale big sources (YouTube
+    # maxresdefault and the like) before the proper resample pass.
+    img.thumbnail((THUMB_WIDTH, THUMB_HEIGHT), Image.Resampling.BILINEAR,
+                  reducing_gap=2.0)
+    # Letterbox by slice-assigning into a zeroed frame; Image.new plus
+    # paste would walk the pixels twice for the same result.
+    canvas = np.zeros((THUMB_HEIGHT, THUMB_WIDTH, 3), dtype=np.uint8)
+    top = (THUMB_HEIGHT - img.height) // 2
+    left = (THUMB_WIDTH - img.width) // 2
+    canvas[top:top + img.height, left:left + img.width] = np.asarray(img)
+    _write_raw(output_path, image_to_rgb565(Image.fromarray(canvas)))
+    return True
+
+
+# ffmpeg letterboxes the grabbed frame to thumbnail size itself, so the
+# bytes on its stdout are exactly one 108x67 RGB24 frame.
+_VF_THUMB = (f"scale={THUMB_WIDTH}:{THUMB_HEIGHT}:force_original_aspect_ratio=decrease,"
+             f"pad={THUMB_WIDTH}:{THUMB_HEIGHT}:(ow-iw)/2:(oh-ih)/2")
+_FRAME_BYTES = THUMB_WIDTH * THUMB_HEIGHT * 3
+
+
+def _grab_frame(video_path: Path, seek: float,
+                seek_flag: str = "-ss") -> Image.Image | None:
+    """Pipe one letterboxed frame out of *video_path* at *seek* seconds."""
+    cmd = ["ffmpeg", seek_flag, str(seek), "-i", str(video_path),
+           "-frames:v", "1", "-vf", _VF_THUMB,
+           "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1"]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, timeout=30)
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    if proc.returncode != 0 or len(proc.stdout) < _FRAME_BYTES:
+        return None
+    return Image.frombytes("RGB", (THUMB_WIDTH, THUMB_HEIGHT),
+                           proc.stdout[:_FRAME_BYTES])
+
+
+def extract_video_frame(video_path: Path,
+                        timestamp: float = 60.0) -> Image.Image | None:
+    """Return one letterboxed 108x67 frame from *video_path*, or None.
+
+    The frame arrives from ffmpeg as raw RGB24 on a pipe, already scaled
+    and letterboxed — no temp PNG, no PNG encode/decode round-trip. For
+    clips shorter than *timestamp* a single retry seeks one second from
+    the end rather than walking a ladder of earlier offsets, so the
+    worst case is two process spawns instead of three. Callers that
+    need the same frame twice (a video thumbnail reused as a playlist
+    cover) can hold on to the returned image.
+    """
+    img = _grab_frame(video_path, timestamp)
+    if img is None:
+        img = _grab_frame(video_path, -1.0, seek_flag="-sseof")
+    return img
+
+
+def generate_thumbnail_from_video(video_path: Path, output_path: Path,
+                                  timestamp: float = 60.0) -> bool:
+    """Grab a frame from *video_path* and write it as a thumbnail."""
+    img = extract_video_frame(video_path, timestamp)
+    if img is None:
+        return False
+    _write_raw(output_path, image_to_rgb565(img))
+    return True
+
+
+def batch_generate_thumbnails(jobs: list[tuple[Path, Path]],
+                              timestamp: float = 60.0) -> int:
+    """Write thumbnails for many videos with a single ffmpeg invocation.
+
+    *jobs* is a list of ``(video_path, output_path)`` pairs.  One ffmpeg
+    process grabs a frame from every input; the frames are then packed
+    to RGB565 in-process.  A job whose grab produced nothing falls back
+    to the single-video path (one retry seeking from the end via
+    ``-sseof``) and finally to a text placeholder, so every output gets
+    written.  Returns the number of thumbnails produced.
+    """
+    if not jobs:
+        return 0
+    tmp_dir = Path(tempfile.mkdtemp(prefix="seinfeld_thumbs_"))
+    cmd = ["ffmpeg", "-y"]
+    for video_path, _ in jobs:
+        cmd += ["-ss", str(timestamp), "-i", str(video_path)]
+    frames = []
+    for index in range(len(jobs)):
+        frame = tmp_dir / f"{index}.png"
+        cmd += ["-map", f"{index}:v", "-frames:v", "1", str(frame)]
+        frames.append(frame)
+    try:
+        subprocess.run(cmd, capture_output=True, timeout=60 * len(jobs))
+    except (subprocess.TimeoutExpired, OSError) as exc:
+        logger.warning("batched frame grab failed: %s", exc)
+
+    written = 0
+    for frame, (video_path, output_path) in zip(frames, jobs):
+        if frame.exists() and frame.stat().st_size > 0 \
+                and generate_thumbnail_from_image(frame, output_path):
+            written += 1
+        elif generate_thumbnail_from_video(video_path, output_path):
+            written += 1
+        elif generate_placeholder_thumbnail(output_path, video_path.stem):
+            written += 1
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    return written
+
+
+@functools.lru_cache(maxsize=8)
+def _load_font(font_path: str | None = None, size: int = 10):
+    """Load the placeholder font once; parsing it per call is pure waste."""
+    from PIL import ImageFont
+
+    if font_path:
+        return ImageFont.truetype(font_path, size)
+    return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=256)
+def _placeholder_bytes(text: str) -> bytes:
+    """Render one placeholder frame as packed RGB565.
+
+    Cached per text: a playlist with repeated or empty titles
+    rasterizes and packs each distinct placeholder once.
+    """
+    from PIL import ImageDraw
+
+    img = Image.new("RGB", (THUMB_WIDTH, THUMB_HEIGHT), (24, 26, 48))
+    if text:
+        draw = ImageDraw.Draw(img)
+        font = _load_font()
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        draw.text(((THUMB_WIDTH - (right - left)) // 2,
+                   (THUMB_HEIGHT - (bottom - top)) // 2),
+                  text, fill=(220, 220, 220), font=font)
+    return image_to_rgb565(img)
+
+
+def generate_placeholder_thumbnail(output_path: Path, text: str = "") -> bool:
+    """Write a flat-colour thumbnail with *text* centred on it."""
+    _write_raw(output_path, _placeholder_bytes(text))
+    return True
+
+
+def generate_thumbnail(output_path: Path, image_path: Path | None = None,
+                       video_path: Path | None = None, text: str = "",
+                       image: Image.Image | None = None) -> bool:
+    """Produce a thumbnail from the best available source.
+
+    Tries an already-decoded *image*, then a still image file, then a
+    video frame, then a text placeholder so that every menu entry gets
+    *some* thumbnail.
+    """
+    if image is not None and generate_thumbnail_from_image(None, output_path,
+                                                           image=image):
+        return True
+    if image_path is not None and generate_thumbnail_from_image(image_path, output_path):
+        return True
+    if video_path is not None and generate_thumbnail_from_video(video_path, output_path):
+        return True
+    return generate_placeholder_thumbnail(output_path, text)
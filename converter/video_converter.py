@@ -0,0 +1,457 @@
+"""Convert TV episodes for the player.
+
+Scans a library of video files, detects season/episode numbers from the
+filenames and converts each episode to the player's 210x135 MJPEG AVI
+format, laid out as ``<output>/S##E##.avi`` plus an RGB565 thumbnail.
+"""
+
+import asyncio
+import collections
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .thumbnail_generator import generate_thumbnail
+
+logger = logging.getLogger(__name__)
+
+TARGET_WIDTH = 210
+TARGET_HEIGHT = 135
+
+# The scale/pad filters never change at runtime; build them once.
+_SCALE_PAD = (f"scale={TARGET_WIDTH}:{TARGET_HEIGHT}:force_original_aspect_ratio=decrease,"
+              f"pad={TARGET_WIDTH}:{TARGET_HEIGHT}:(ow-iw)/2:(oh-ih)/2")
+_SCALE_PAD_VAAPI = (f"scale_vaapi=w={TARGET_WIDTH}:h={TARGET_HEIGHT}:"
+                    f"force_original_aspect_ratio=decrease,"
+                    f"pad_vaapi={TARGET_WIDTH}:{TARGET_HEIGHT}:(ow-iw)/2:(oh-ih)/2")
+_AUDIO_ARGS = ("-c:a", "pcm_u8", "-ar", "11025", "-ac", "1")
+
+VIDEO_EXTENSIONS = frozenset({".mp4", ".mkv", ".avi", ".webm", ".mov"})
+_VIDEO_SUFFIXES = tuple(VIDEO_EXTENSIONS)
+
+# One alternation covering every filename form, compiled once at
+# import: a single pass per file instead of up to four. The branches
+# are ordered by reliability; _detect_from_stem enforces that ranking
+# across all matches in the stem.
+_EP_PATTERN = re.compile(
+    r"[Ss](?P<s1>\d{1,2})[Ee](?P<e1>\d{1,3})"
+    r"|(?P<s2>\d{1,2})x(?P<e2>\d{2,3})"
+    r"|[Ss]eason\s*(?P<s3>\d+)\s*[Ee]pisode\s*(?P<e3>\d+)"
+    r"|_(?P<s4>\d)(?P<e4>\d{2})(?:\D|$)"
+)
+_EP_GROUPS = (("s1", "e1"), ("s2", "e2"), ("s3", "e3"), ("s4", "e4"))
+
+_SEASON_DIR_RE = re.compile(r"[Ss]eason[ ._-]*(\d+)")
+
+
+@functools.lru_cache(maxsize=8192)
+def _detect_from_stem(stem: str) -> tuple[int, int] | None:
+    """Run the episode regex over one stem; memoized.
+
+    Generic names like "Episode 01" recur across season folders and
+    whole libraries get re-scanned, so cache hits skip the regex
+    entirely.
+
+    All matches are ranked by branch order rather than position, so an
+    explicit ``S03E01`` tag wins over a ``3x01`` token anywhere in the
+    stem — a resolution string like ``640x480`` earlier in the name
+    must not hijack detection.
+    """
+    best = None
+    best_rank = len(_EP_GROUPS)
+    for match in _EP_PATTERN.finditer(stem):
+        for rank, (season_group, episode_group) in enumerate(_EP_GROUPS):
+            if rank >= best_rank:
+                break
+            season = match.group(season_group)
+            if season is not None:
+                best = (int(season), int(match.group(episode_group)))
+                best_rank = rank
+                break
+        if best_rank == 0:
+            break
+    return best
+
+
+def detect_episode_info(filename) -> tuple[int, int] | None:
+    """Extract ``(season, episode)`` from a file name, or None.
+
+    Understands ``S03E01``, ``3x01``, ``Season 3 Episode 1`` and the
+    compact ``seinfeld_301`` form.
+    """
+    return _detect_from_stem(Path(filename).stem)
+
+
+def _walk(root: Path | str, season_filter: int | None = None):
+    """Yield ``(name, path)`` for every video file under *root*.
+
+    An explicit scandir stack keeps the walk to one syscall per
+    directory; entries are filtered on the name before any stat, and
+    Path objects are never built for files we discard. With
+    *season_filter*, subtrees whose directory name announces a
+    different season ("Season 4" etc.) are pruned without entering.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if season_filter is not None:
+                        match = _SEASON_DIR_RE.search(entry.name)
+                        if match and int(match.group(1)) != season_filter:
+                            continue
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(_VIDEO_SUFFIXES):
+                    yield entry.name, entry.path
+
+
+def scan_input_directory(input_dir: Path,
+                         season_filter: int | None = None) -> list[tuple[int, int, Path]]:
+    """Find episodes under *input_dir*, sorted by (season, episode).
+
+    Episode detection is batched over the collected names on a small
+    thread pool; the real win on re-scans is the _detect_from_stem
+    memo cache, which skips the regex for names seen before.
+    """
+    candidates = list(_walk(input_dir, season_filter=season_filter))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        infos = pool.map(detect_episode_info,
+                         (name for name, _ in candidates), chunksize=64)
+        episodes = []
+        for (name, path), info in zip(candidates, infos):
+            if info is None:
+                logger.debug("no episode info in %s", name)
+                continue
+            season, episode = info
+            if season_filter is not None and season != season_filter:
+                continue
+            episodes.append((season, episode, Path(path)))
+    episodes.sort(key=lambda item: (item[0], item[1]))
+    return episodes
+
+
+def _drain_stderr(stream, tail: collections.deque) -> None:
+    for line in stream:
+        tail.append(line)
+    stream.close()
+
+
+def _detect_hwaccels() -> frozenset[str]:
+    """Ask ffmpeg which hardware accelerators this host offers."""
+    try:
+        result = subprocess.run(["ffmpeg", "-hide_banner", "-hwaccels"],
+                                capture_output=True, timeout=10)
+    except (subprocess.TimeoutExpired, OSError):
+        return frozenset()
+    if result.returncode != 0:
+        return frozenset()
+    lines = result.stdout.decode(errors="replace").splitlines()
+    return frozenset(line.strip() for line in lines[1:] if line.strip())
+
+
+_HWACCELS = _detect_hwaccels()
+
+
+def _convert_cache_path() -> Path:
+    root = os.environ.get("SEINFELD_TV_CACHE_DIR")
+    base = Path(root) if root else Path.home() / ".cache" / "seinfeld_tv"
+    return base / "convert.json"
+
+
+def _load_convert_cache() -> dict:
+    try:
+        return json.loads(_convert_cache_path().read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_convert_entry(key: str, entry: list) -> None:
+    cache = _load_convert_cache()
+    cache[key] = entry
+    path = _convert_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(cache))
+    except OSError as exc:
+        logger.warning("could not update convert cache: %s", exc)
+
+
+def _source_cache_entry(input_path: Path, fps: int, quality: int) -> list | None:
+    """Freshness fingerprint for *input_path*, or None if it is missing."""
+    try:
+        src_stat = os.stat(input_path)
+    except FileNotFoundError:
+        return None
+    return [src_stat.st_mtime_ns, src_stat.st_size, fps, quality]
+
+
+def _output_up_to_date(cache_key: str, cache_entry: list | None,
+                       output_path: Path) -> bool:
+    """True when the recorded conversion for *cache_key* is still valid."""
+    if cache_entry is None:
+        return False
+    try:
+        return (_load_convert_cache().get(cache_key) == cache_entry
+                and os.stat(output_path).st_size > 0)
+    except FileNotFoundError:
+        return False
+
+
+def _avi_cache_dir() -> Path:
+    root = os.environ.get("SEINFELD_TV_CACHE_DIR")
+    base = Path(root) if root else Path.home() / ".cache" / "seinfeld_tv"
+    return base / "avi"
+
+
+def _content_key(input_path: Path, size: int, fps: int, quality: int) -> str | None:
+    """Content-addressed cache key: first 1 MB of the source + size + settings.
+
+    The head of the file plus its exact size is enough to tell identical
+    sources apart without hashing multi-gigabyte inputs.
+    """
+    try:
+        with open(input_path, "rb") as handle:
+            head = handle.read(1 << 20)
+    except OSError:
+        return None
+    digest = hashlib.blake2b(head, digest_size=16)
+    digest.update(f"{size}:{fps}:{quality}".encode())
+    return digest.hexdigest()
+
+
+def _link_or_copy(src: Path, dst: Path) -> bool:
+    """Hardlink *src* to *dst*, copying when they sit on different filesystems."""
+    try:
+        dst.unlink(missing_ok=True)
+        os.link(src, dst)
+        return True
+    except OSError:
+        pass
+    try:
+        shutil.copyfile(src, dst)
+        return True
+    except OSError as exc:
+        logger.debug("avi cache copy failed for %s: %s", dst, exc)
+        return False
+
+
+def _build_ffmpeg_cmd(input_path: Path, output_path: Path, fps: int,
+                      quality: int, extra_input_args: tuple = (),
+                      extra_output_args: tuple = _AUDIO_ARGS) -> list[str]:
+    """Assemble the CPU MJPEG command line shared by every converter."""
+    return ["ffmpeg", "-y", *extra_input_args, "-i", str(input_path),
+            "-vf", _SCALE_PAD, "-r", str(fps),
+            "-c:v", "mjpeg", "-q:v", str(quality),
+            *extra_output_args, str(output_path)]
+
+
+def _run_ffmpeg(cmd: list[str], input_path: Path, timeout: int = 3600) -> bool:
+    """Run one ffmpeg conversion, keeping only the tail of its stderr.
+
+    A full episode can emit megabytes of progress lines; they are
+    drained into a bounded deque as they arrive and logged on failure.
+    """
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE)
+    except OSError as exc:
+        logger.error("ffmpeg failed for %s: %s", input_path, exc)
+        return False
+    tail: collections.deque = collections.deque(maxlen=200)
+    drain = threading.Thread(target=_drain_stderr, args=(proc.stderr, tail),
+                             daemon=True)
+    drain.start()
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        logger.error("ffmpeg timed out for %s", input_path)
+        return False
+    drain.join()
+    if returncode != 0:
+        logger.error("ffmpeg exited %d for %s:\n%s", returncode, input_path,
+                     b"".join(tail).decode(errors="replace"))
+        return False
+    return True
+
+
+def convert_video(input_path: Path, output_path: Path, fps: int = 24,
+                  quality: int = 7, hwaccel: str | None = "auto") -> bool:
+    """Convert *input_path* to the player's MJPEG AVI format.
+
+    Hosts whose ffmpeg reports VAAPI get the GPU MJPEG encoder first,
+    with the CPU pipeline as fallback. Even on the CPU encode path,
+    *hwaccel* offloads the source decode (usually the H.264/HEVC side
+    is the expensive half); a failed hwaccel run is retried without.
+
+    Finished conversions are recorded in a small JSON cache keyed on
+    the output path, so re-packaging a library skips every episode
+    whose source and settings are unchanged.
+    """
+    cache_key = os.path.abspath(os.fspath(output_path))
+    cache_entry = _source_cache_entry(input_path, fps, quality)
+    if _output_up_to_date(cache_key, cache_entry, output_path):
+        logger.debug("keeping up-to-date %s", output_path)
+        return True
+
+    # Content-addressed cache: the same source converted into several
+    # playlists is encoded once and hardlinked everywhere else.
+    cached_avi = None
+    if cache_entry is not None:
+        content_key = _content_key(input_path, cache_entry[1], fps, quality)
+        if content_key is not None:
+            cached_avi = _avi_cache_dir() / f"{content_key}.avi"
+            try:
+                if cached_avi.stat().st_size > 0 and _link_or_copy(cached_avi,
+                                                                   output_path):
+                    logger.debug("linked %s from avi cache", output_path)
+                    _store_convert_entry(cache_key, cache_entry)
+                    return True
+            except FileNotFoundError:
+                pass
+
+    def _done() -> bool:
+        if cache_entry is not None:
+            _store_convert_entry(cache_key, cache_entry)
+        if cached_avi is not None and not cached_avi.exists():
+            try:
+                cached_avi.parent.mkdir(parents=True, exist_ok=True)
+                _link_or_copy(output_path, cached_avi)
+            except OSError as exc:
+                logger.debug("could not populate avi cache: %s", exc)
+        return True
+
+    if "vaapi" in _HWACCELS:
+        hw_cmd = [
+            "ffmpeg", "-y", "-hwaccel", "vaapi",
+            "-hwaccel_output_format", "vaapi", "-i", str(input_path),
+            "-vf", _SCALE_PAD_VAAPI,
+            "-r", str(fps), "-c:v", "mjpeg_vaapi", "-q:v", str(quality),
+            *_AUDIO_ARGS, str(output_path),
+        ]
+        if _run_ffmpeg(hw_cmd, input_path):
+            return _done()
+        logger.warning("vaapi encode failed for %s; retrying on CPU",
+                       input_path)
+
+    def _cpu_cmd(accel: str | None) -> list[str]:
+        return _build_ffmpeg_cmd(
+            input_path, output_path, fps, quality,
+            extra_input_args=("-hwaccel", accel) if accel else ())
+
+    if _run_ffmpeg(_cpu_cmd(hwaccel), input_path):
+        return _done()
+    if not hwaccel:
+        return False
+    logger.warning("retrying %s without -hwaccel", input_path)
+    return _run_ffmpeg(_cpu_cmd(None), input_path) and _done()
+
+
+async def convert_video_async(input_path: Path, output_path: Path,
+                              fps: int = 24, quality: int = 7) -> bool:
+    """Convert one video on the running event loop.
+
+    For callers already orchestrating async work (batch conversion,
+    overlap with downloads); shares the skip cache with convert_video,
+    which remains the feature-full primitive with hwaccel fallback.
+    """
+    cache_key = os.path.abspath(os.fspath(output_path))
+    cache_entry = _source_cache_entry(input_path, fps, quality)
+    if _output_up_to_date(cache_key, cache_entry, output_path):
+        logger.debug("keeping up-to-date %s", output_path)
+        return True
+    cmd = _build_ffmpeg_cmd(input_path, output_path, fps, quality,
+                            extra_output_args=(*_AUDIO_ARGS, "-threads", "2"))
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL)
+    except OSError as exc:
+        logger.error("ffmpeg failed for %s: %s", input_path, exc)
+        return False
+    returncode = await proc.wait()
+    if returncode != 0:
+        logger.error("ffmpeg exited %d for %s", returncode, input_path)
+        return False
+    if cache_entry is not None:
+        _store_convert_entry(cache_key, cache_entry)
+    return True
+
+
+async def _convert_one_async(sem: asyncio.Semaphore, input_path: Path,
+                             output_path: Path, fps: int, quality: int) -> bool:
+    async with sem:
+        return await convert_video_async(input_path, output_path, fps, quality)
+
+
+def convert_many(jobs: list[tuple[Path, Path]], fps: int = 24,
+                 quality: int = 7,
+                 concurrency: int | None = None) -> list[bool]:
+    """Convert many ``(input, output)`` pairs with overlapping ffmpegs.
+
+    A single ffmpeg spends much of a conversion waiting on decode I/O,
+    so up to *concurrency* processes run at once (default: half the
+    cores, capped at 4), each limited to two encoder threads to keep
+    the aggregate near cpu_count.
+    """
+    if concurrency is None:
+        concurrency = max(1, min(4, (os.cpu_count() or 2) // 2))
+
+    async def _run():
+        sem = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(
+            *(_convert_one_async(sem, input_path, output_path, fps, quality)
+              for input_path, output_path in jobs))
+
+    return list(asyncio.run(_run()))
+
+
+def convert_boot_clip(input_path: Path, output_path: Path, duration: int = 5,
+                      fps: int = 24, quality: int = 7,
+                      hwaccel: str | None = "auto") -> bool:
+    """Convert the first *duration* seconds of a clip for the boot screen."""
+    attempts = (hwaccel, None) if hwaccel else (None,)
+    for accel in attempts:
+        cmd = _build_ffmpeg_cmd(
+            input_path, output_path, fps, quality,
+            extra_input_args=("-hwaccel", accel) if accel else (),
+            extra_output_args=("-t", str(duration), "-an"))
+        try:
+            result = subprocess.run(cmd, capture_output=True, timeout=600)
+        except (subprocess.TimeoutExpired, OSError) as exc:
+            logger.error("ffmpeg failed for %s: %s", input_path, exc)
+            return False
+        if result.returncode == 0:
+            return True
+        if accel:
+            logger.warning("retrying %s without -hwaccel", input_path)
+    return False
+
+
+def package_episodes(input_dir: Path, output_dir: Path, fps: int = 24,
+                     quality: int = 7, season_filter: int | None = None) -> int:
+    """Convert every detected episode; returns the number converted."""
+    episodes = scan_input_directory(input_dir, season_filter=season_filter)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(path, output_dir / f"S{season:02d}E{episode:02d}.avi")
+            for season, episode, path in episodes]
+    results = convert_many(jobs, fps=fps, quality=quality) if jobs else []
+    converted = 0
+    for (season, episode, path), ok in zip(episodes, results):
+        if not ok:
+            logger.warning("skipping %s", path)
+            continue
+        stem = f"S{season:02d}E{episode:02d}"
+        generate_thumbnail(output_dir / f"{stem}.raw", video_path=path, text=stem)
+        converted += 1
+    return converted
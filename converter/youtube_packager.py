@@ -0,0 +1,584 @@
+"""Package a YouTube playlist (or single video) for the player.
+
+Produces:
+
+    <output>/<Playlist_Name>/
+        playlist.sdb  playlist.raw
+        Y01.avi  Y01.sdb  Y01.raw  ...
+
+yt-dlp handles listing and downloading; ffmpeg converts each source to
+the player's 210x135 MJPEG AVI format.
+"""
+
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+
+from . import meta_cache
+from .binary_writer import (
+    write_youtube_playlist_metadata,
+    write_youtube_video_metadata,
+)
+from .thumbnail_generator import extract_video_frame, generate_thumbnail
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+TARGET_WIDTH = 210
+TARGET_HEIGHT = 135
+
+# Listings go stale (new uploads, deletions), so cached video info is
+# only trusted for a day by default.
+_INFO_TTL = 24 * 3600
+
+
+def _info_ttl() -> float:
+    """Listing cache TTL in seconds; SEINFELD_TV_YTINFO_TTL overrides
+    the default (set it to 0 to always re-fetch, e.g. in CI)."""
+    try:
+        return float(os.environ["SEINFELD_TV_YTINFO_TTL"])
+    except (KeyError, ValueError):
+        return _INFO_TTL
+
+# Paces the per-video acquire/convert stage. The batch pass stages
+# every missing source up front (one yt-dlp process beats a download
+# per video), so this no longer bounds what sits on disk; it bounds
+# how many fallback downloads and conversions run at once.
+_STAGING_SLOTS = threading.BoundedSemaphore(2)
+
+# One keep-alive pool for every thumbnail fetch: a 50-video playlist is
+# 50 GETs against the same image host, which should cost one TLS
+# handshake, not 50.
+_thumb_session = requests.Session()
+_thumb_session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
+
+# Compiled once: sanitize_name runs per video inside the parallel
+# packaging loop, so even re's internal cache lookup is per-call waste.
+_RE_NON_ALNUM = re.compile(r"[^A-Za-z0-9_]+")
+_RE_UNDERSCORES = re.compile(r"_+")
+
+
+def sanitize_name(name: str) -> str:
+    """Turn *name* into a short, filesystem-safe directory name."""
+    s = _RE_NON_ALNUM.sub("_", name)
+    s = _RE_UNDERSCORES.sub("_", s).strip("_")
+    if len(s) > 31:
+        s = s[:31].rstrip("_")
+    return s or "Playlist"
+
+
+def _nonempty(path: Path) -> bool:
+    """True if *path* exists with content — one stat, not exists()+stat()."""
+    try:
+        return path.stat().st_size > 0
+    except OSError:
+        return False
+
+
+def _upload_year(upload_date: str | None) -> int:
+    """Extract the year from yt-dlp's YYYYMMDD upload_date, or 0."""
+    if upload_date and len(upload_date) >= 4 and upload_date[:4].isdigit():
+        return int(upload_date[:4])
+    return 0
+
+
+@dataclass(frozen=True, slots=True)
+class VideoEntry:
+    """One playlist entry with yt-dlp's fields normalized up front.
+
+    The get()-with-fallback chains run once per entry here instead of
+    being repeated through the processing pipeline, and the frozen
+    instances are safe to share across worker threads.
+    """
+    video_id: str
+    title: str
+    url: str
+    uploader: str
+    duration_seconds: int
+    upload_year: int
+    thumbnail_url: str
+
+    @classmethod
+    def from_dict(cls, info: dict, fallback_url: str) -> "VideoEntry":
+        return cls(
+            video_id=info.get("id") or "",
+            title=info.get("title") or "",
+            url=info.get("webpage_url") or info.get("url") or fallback_url,
+            uploader=info.get("uploader") or "",
+            duration_seconds=int(info.get("duration") or 0),
+            upload_year=_upload_year(info.get("upload_date")),
+            thumbnail_url=info.get("thumbnail") or "",
+        )
+
+
+def _ytdlp_cmd(cookies_from_browser: str | None = None) -> list[str]:
+    cmd = [sys.executable, "-m", "yt_dlp", "--no-warnings"]
+    if cookies_from_browser:
+        cmd += ["--cookies-from-browser", cookies_from_browser]
+    return cmd
+
+
+# The in-process yt-dlp API, resolved on first use; False once the
+# import turned out to fail so only one attempt is ever made.
+_ydl_class = None
+
+
+def _get_ydl_class():
+    """Return yt_dlp.YoutubeDL when importable in-process, or None.
+
+    Running in-process skips a fresh interpreter startup and extractor
+    import per call; hosts without the package fall back to the
+    subprocess path.
+    """
+    global _ydl_class
+    if _ydl_class is None:
+        try:
+            from yt_dlp import YoutubeDL
+        except ImportError:
+            _ydl_class = False
+        else:
+            _ydl_class = YoutubeDL
+    return _ydl_class or None
+
+
+def _ydl_opts(cookies_from_browser: str | None) -> dict:
+    opts = {"quiet": True, "no_warnings": True}
+    if cookies_from_browser:
+        opts["cookiesfrombrowser"] = (cookies_from_browser,)
+    return opts
+
+
+def get_video_info(url: str,
+                   cookies_from_browser: str | None = None) -> list[dict]:
+    """Fetch metadata for every video behind *url* (playlist or single).
+
+    Results are cached on disk for a day, so re-runs of the same
+    playlist skip the yt-dlp subprocess and its network round-trips.
+    """
+    # Cookies change what yt-dlp can see (age-gated or private videos),
+    # so they are part of the key rather than a source of stale hits.
+    key = meta_cache.make_key("ytinfo", f"{url}|{cookies_from_browser}")
+    cached = meta_cache.get(key, max_age=_info_ttl())
+    if cached is not None:
+        return cached["infos"]
+    ydl_cls = _get_ydl_class()
+    if ydl_cls is not None:
+        infos = _extract_infos_inprocess(ydl_cls, url, cookies_from_browser)
+        if infos:
+            meta_cache.put(key, {"infos": infos})
+        return infos
+    # --flat-playlist lists a playlist with one request instead of
+    # fetching every video page; the stub entries are fleshed out
+    # per video later, only when their metadata is actually needed.
+    cmd = _ytdlp_cmd(cookies_from_browser) + ["--flat-playlist",
+                                              "--dump-json", url]
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True,
+                                bufsize=1)
+    except OSError as exc:
+        logger.error("yt-dlp failed for %s: %s", url, exc)
+        return []
+    # Parse each JSON line as yt-dlp emits it (bufsize=1 keeps the pipe
+    # line-buffered) instead of buffering the whole listing; a long
+    # playlist's stdout never sits in memory twice, and parsing runs
+    # while yt-dlp is still extracting later entries. orjson takes over
+    # the decode when installed. The function still returns a list —
+    # the day-long disk cache needs the complete listing anyway.
+    infos = []
+    for line in proc.stdout:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            infos.append(_json_loads(line))
+        except ValueError:
+            # One garbled line (a warning leaking onto stdout) should
+            # not discard an otherwise good listing.
+            logger.debug("skipping malformed listing line for %s", url)
+    try:
+        returncode = proc.wait(timeout=600)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        logger.error("yt-dlp timed out for %s", url)
+        return []
+    if returncode != 0:
+        logger.error("yt-dlp exited %d for %s", returncode, url)
+        return []
+    if infos:
+        meta_cache.put(key, {"infos": infos})
+    return infos
+
+
+def _extract_infos_inprocess(ydl_cls, url: str,
+                             cookies_from_browser: str | None) -> list[dict]:
+    """List videos through the yt-dlp API — dicts straight from the
+    extractor, no subprocess and no JSON round-trip.
+
+    Playlists are listed flat (id/title/url stubs from one request);
+    per-video details are fetched lazily by _fetch_entry_details.
+    """
+    opts = _ydl_opts(cookies_from_browser)
+    opts["extract_flat"] = "in_playlist"
+    try:
+        with ydl_cls(opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+            if info is None:
+                return []
+            entries = info.get("entries")
+            if entries is None:
+                return [ydl.sanitize_info(info)]
+            infos = [ydl.sanitize_info(entry) for entry in entries if entry]
+            for entry in infos:
+                entry.setdefault("playlist_title", info.get("title"))
+            return infos
+    except Exception as exc:
+        logger.error("yt-dlp failed for %s: %s", url, exc)
+        return []
+
+
+def _needs_details(entry: VideoEntry) -> bool:
+    """True for a flat-listing stub that carries no real metadata."""
+    return not (entry.thumbnail_url or entry.duration_seconds
+                or entry.upload_year)
+
+
+def _fetch_entry_details(entry: VideoEntry,
+                         cookies_from_browser: str | None) -> VideoEntry:
+    """Flesh out one flat-listing stub with a per-video info fetch.
+
+    Runs inside the worker pool, so detail fetches overlap with other
+    videos' downloads and conversions; on any failure the stub is kept
+    and packaging proceeds with placeholder metadata.
+    """
+    ydl_cls = _get_ydl_class()
+    if ydl_cls is not None:
+        try:
+            with ydl_cls(_ydl_opts(cookies_from_browser)) as ydl:
+                info = ydl.extract_info(entry.url, download=False)
+                if info:
+                    return VideoEntry.from_dict(ydl.sanitize_info(info),
+                                                entry.url)
+        except Exception as exc:
+            logger.warning("detail fetch failed for %s: %s", entry.url, exc)
+        return entry
+    cmd = _ytdlp_cmd(cookies_from_browser) + ["--dump-json", entry.url]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True,
+                                timeout=120)
+    except (subprocess.TimeoutExpired, OSError) as exc:
+        logger.warning("detail fetch failed for %s: %s", entry.url, exc)
+        return entry
+    if result.returncode == 0:
+        for line in result.stdout.splitlines():
+            line = line.strip()
+            if line:
+                try:
+                    return VideoEntry.from_dict(_json_loads(line), entry.url)
+                except ValueError:
+                    continue
+    return entry
+
+
+def download_video(url: str, output_path: Path,
+                   cookies_from_browser: str | None = None) -> bool:
+    """Download one video to *output_path* at player-friendly quality."""
+    ydl_cls = _get_ydl_class()
+    if ydl_cls is not None:
+        opts = _ydl_opts(cookies_from_browser)
+        opts["format"] = "best[height<=480]/best"
+        opts["outtmpl"] = {"default": str(output_path)}
+        try:
+            with ydl_cls(opts) as ydl:
+                ydl.download([url])
+        except Exception as exc:
+            logger.error("yt-dlp download failed for %s: %s", url, exc)
+            return False
+        return _nonempty(output_path)
+    cmd = _ytdlp_cmd(cookies_from_browser) + [
+        "-f", "best[height<=480]/best", "-o", str(output_path), url,
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=3600)
+    except (subprocess.TimeoutExpired, OSError) as exc:
+        logger.error("yt-dlp download failed for %s: %s", url, exc)
+        return False
+    if result.returncode != 0:
+        logger.error("yt-dlp exited %d for %s", result.returncode, url)
+        return False
+    return _nonempty(output_path)
+
+
+# Cached source downloads are evicted least-recently-used past this
+# total size.
+_SOURCE_CACHE_CAP = 20 * 1024 ** 3
+
+
+def _source_cache_dir() -> Path:
+    root = os.environ.get("SEINFELD_TV_CACHE_DIR")
+    base = Path(root) if root else Path.home() / ".cache" / "seinfeld_tv"
+    return base / "yt_sources"
+
+
+def _cached_source(video_id: str) -> Path:
+    return _source_cache_dir() / f"{video_id}.mp4"
+
+
+def _evict_source_cache(cap_bytes: int = _SOURCE_CACHE_CAP) -> None:
+    """Drop least-recently-used cached sources once the total tops the cap."""
+    try:
+        entries = [(path.stat().st_mtime, path.stat().st_size, path)
+                   for path in _source_cache_dir().iterdir() if path.is_file()]
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    entries.sort()
+    for _, size, path in entries:
+        if total <= cap_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def _acquire_source(entry: VideoEntry, playlist_dir: Path, stem: str,
+                    cookies_from_browser: str | None) -> tuple[Path, bool] | None:
+    """Produce this video's source file; returns ``(path, persistent)``.
+
+    Videos with an id live in the user source cache, so a re-run after
+    a partial failure skips their downloads entirely; batch-staged
+    files are promoted into the cache. Videos without an id fall back
+    to a transient download beside the outputs.
+    """
+    if entry.video_id:
+        cached = _cached_source(entry.video_id)
+        if _nonempty(cached):
+            os.utime(cached)
+            return cached, True
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        staged = _staged_source(entry.video_id, playlist_dir)
+        if staged is not None:
+            # The playlist dir (often an SD card) and the cache rarely
+            # share a filesystem, where rename cannot cross.
+            try:
+                staged.replace(cached)
+                return cached, True
+            except OSError:
+                try:
+                    shutil.move(os.fspath(staged), cached)
+                    return cached, True
+                except OSError as exc:
+                    logger.warning("could not promote staged %s: %s",
+                                   staged, exc)
+        if download_video(entry.url, cached, cookies_from_browser):
+            return cached, True
+        return None
+    source = playlist_dir / f"{stem}.source.mp4"
+    if download_video(entry.url, source, cookies_from_browser):
+        return source, False
+    return None
+
+
+def _batch_download_sources(entries: list[VideoEntry], playlist_dir: Path,
+                            cookies_from_browser: str | None) -> None:
+    """Fetch every source with one yt-dlp process instead of N.
+
+    Each yt-dlp spawn pays interpreter startup plus extractor init, so a
+    playlist is fed as a batch file on stdin and downloaded by a single
+    process into id-keyed staging files. Entries without an id (or
+    anything this pass fails to produce) fall back to the per-video
+    download inside _process_video.
+    """
+    urls = [entry.url for entry in entries
+            if entry.video_id and not _nonempty(_cached_source(entry.video_id))]
+    if not urls:
+        return
+    cmd = _ytdlp_cmd(cookies_from_browser) + [
+        "-f", "best[height<=480]/best", "-a", "-",
+        "-o", str(playlist_dir / "src_%(id)s.%(ext)s"),
+    ]
+    try:
+        subprocess.run(cmd, input="\n".join(urls), text=True,
+                       capture_output=True, timeout=3600 * len(urls))
+    except (subprocess.TimeoutExpired, OSError) as exc:
+        logger.warning("batch download failed, falling back per video: %s", exc)
+
+
+def _staged_source(video_id: str, playlist_dir: Path) -> Path | None:
+    """Return this video's batch-downloaded staging file, if any."""
+    for candidate in playlist_dir.glob(f"src_{video_id}.*"):
+        if _nonempty(candidate):
+            return candidate
+    return None
+
+
+def download_thumbnail(url: str, output_path: Path) -> bool:
+    """Fetch a video's thumbnail image over HTTP.
+
+    The body streams straight from the socket to the file in 64 KB
+    chunks, so a large thumbnail is never held in memory whole (let
+    alone twice, as response.content plus write_bytes would).
+    """
+    try:
+        with _thumb_session.get(url, timeout=30, stream=True) as resp:
+            resp.raise_for_status()
+            with output_path.open("wb") as handle:
+                shutil.copyfileobj(resp.raw, handle, length=64 * 1024)
+    except (requests.RequestException, OSError) as exc:
+        logger.warning("thumbnail fetch failed for %s: %s", url, exc)
+        return False
+    return True
+
+
+def _fetch_thumbnail_image(url: str) -> Image.Image | None:
+    """Fetch and decode a thumbnail without touching the disk.
+
+    The JPEG is decoded once from an in-memory buffer and handed to the
+    thumbnail generator as pixels, instead of being written out only to
+    be re-read and re-decoded a moment later.
+    """
+    try:
+        with _thumb_session.get(url, timeout=30, stream=True) as resp:
+            resp.raise_for_status()
+            buf = io.BytesIO()
+            shutil.copyfileobj(resp.raw, buf, length=64 * 1024)
+        img = Image.open(buf)
+        return img.convert("RGB")
+    except (requests.RequestException, OSError) as exc:
+        logger.warning("thumbnail fetch failed for %s: %s", url, exc)
+        return None
+
+
+def convert_video_to_avi(input_path: Path, output_path: Path, fps: int = 10,
+                         quality: int = 7) -> bool:
+    """Convert *input_path* to the player's MJPEG AVI format."""
+    cmd = [
+        "ffmpeg", "-y", "-i", str(input_path),
+        "-vf", f"scale={TARGET_WIDTH}:{TARGET_HEIGHT}:force_original_aspect_ratio=decrease,"
+               f"pad={TARGET_WIDTH}:{TARGET_HEIGHT}:(ow-iw)/2:(oh-ih)/2",
+        "-r", str(fps), "-c:v", "mjpeg", "-q:v", str(quality),
+        "-c:a", "pcm_u8", "-ar", "11025", "-ac", "1",
+        str(output_path),
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=3600)
+    except (subprocess.TimeoutExpired, OSError) as exc:
+        logger.error("ffmpeg failed for %s: %s", input_path, exc)
+        return False
+    if result.returncode != 0:
+        logger.error("ffmpeg exited %d for %s", result.returncode, input_path)
+        return False
+    return True
+
+
+def _process_video(video_no: int, entry: VideoEntry, playlist_dir: Path,
+                   fps: int, quality: int,
+                   cookies_from_browser: str | None) -> tuple[int, bool, Image.Image | None]:
+    """Download, convert and package one playlist entry.
+
+    Returns ``(video_no, success, thumb_image)``; the decoded thumbnail
+    is handed back so the caller can reuse one for the playlist cover.
+    """
+    stem = f"Y{video_no:02d}"
+    if _needs_details(entry):
+        entry = _fetch_entry_details(entry, cookies_from_browser)
+    title = entry.title or stem
+    thumb = None
+    if entry.thumbnail_url:
+        thumb = _fetch_thumbnail_image(entry.thumbnail_url)
+    with _STAGING_SLOTS:
+        acquired = _acquire_source(entry, playlist_dir, stem,
+                                   cookies_from_browser)
+        if acquired is None:
+            logger.warning("skipping %s", title)
+            return video_no, False, thumb
+        source, persistent = acquired
+        try:
+            if not convert_video_to_avi(source, playlist_dir / f"{stem}.avi",
+                                        fps=fps, quality=quality):
+                logger.warning("skipping %s", title)
+                return video_no, False, thumb
+            write_youtube_video_metadata(
+                playlist_dir / f"{stem}.sdb",
+                title=title,
+                uploader=entry.uploader,
+                duration_seconds=entry.duration_seconds,
+                upload_year=entry.upload_year,
+            )
+            if thumb is None:
+                # Extract the frame here rather than inside
+                # generate_thumbnail so it can double as the playlist
+                # cover without a second ffmpeg grab and decode.
+                thumb = extract_video_frame(source)
+            generate_thumbnail(playlist_dir / f"{stem}.raw", image=thumb,
+                               video_path=source, text=title)
+        finally:
+            if not persistent:
+                source.unlink(missing_ok=True)
+    return video_no, True, thumb
+
+
+def package_youtube(url: str, output_dir: Path, fps: int = 10,
+                    quality: int = 7,
+                    cookies_from_browser: str | None = None,
+                    workers: int = 4) -> bool:
+    """Package every video behind *url* into one playlist directory.
+
+    Each video's whole pipeline (downloads, ffmpeg conversion,
+    metadata, thumbnail) runs as one task on a thread pool — the heavy
+    work lives in yt-dlp and ffmpeg subprocesses, which release the
+    GIL, so up to *workers* videos overlap. Keep *workers* modest:
+    YouTube rate-limits aggressive parallel downloads. Only the
+    playlist-level metadata write stays serial at the end.
+    """
+    infos = get_video_info(url, cookies_from_browser)
+    if not infos:
+        logger.warning("no videos found at %s", url)
+        return False
+
+    playlist_title = infos[0].get("playlist_title") or infos[0].get("title") or url
+    playlist_dir = output_dir / sanitize_name(playlist_title)
+    playlist_dir.mkdir(parents=True, exist_ok=True)
+
+    entries = [VideoEntry.from_dict(info, url) for info in infos]
+    _batch_download_sources(entries, playlist_dir, cookies_from_browser)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_process_video, video_no, entry, playlist_dir,
+                               fps, quality, cookies_from_browser)
+                   for video_no, entry in enumerate(entries, start=1)]
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    converted = sum(1 for _, ok, _ in results if ok)
+    with_thumbs = [(video_no, thumb) for video_no, ok, thumb in results
+                   if ok and thumb is not None]
+    first_thumb = min(with_thumbs, default=(0, None),
+                      key=lambda item: item[0])[1]
+
+    write_youtube_playlist_metadata(playlist_dir / "playlist.sdb",
+                                    name=playlist_title, num_videos=converted)
+    generate_thumbnail(playlist_dir / "playlist.raw", image=first_thumb,
+                       text=playlist_title)
+    _evict_source_cache()
+    return converted > 0
@@ -0,0 +1,184 @@
+"""Generate the firmware's menu-icon header from PNG sources.
+
+Reads ``icons/<name>.png``, packs each into 48x48 big-endian RGB565 and
+emits a C header of ``const uint16_t`` arrays that the UI blits
+directly.  Run from the repo root:
+
+    python scripts/generate_icons.py icons/ include/icons.h
+"""
+
+import argparse
+import functools
+import io
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+ICON_SIZE = 48
+
+ICON_NAMES = (
+    "tv",
+    "movies",
+    "music",
+    "music_videos",
+    "photos",
+    "youtube",
+    "settings",
+)
+
+_HEX_PER_LINE = 12
+
+
+def rgb_to_565(r: int, g: int, b: int) -> int:
+    """Pack one 24-bit RGB pixel into 16-bit RGB565."""
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+# Optional numba kernel, compiled on first use; False once numba turned
+# out to be unavailable so the import is only attempted once.
+_numba_pack = None
+
+
+def _get_numba_pack():
+    """Return a jitted pack kernel over a stacked icon set, or None."""
+    global _numba_pack
+    if _numba_pack is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _numba_pack = False
+        else:
+            @njit(parallel=True, cache=True)
+            def _pack(arr, out):
+                # Fuses the masks, shifts and ORs into one tight loop
+                # over the (N, H, W, 3) stack.
+                for i in prange(arr.shape[0]):
+                    for y in range(arr.shape[1]):
+                        for x in range(arr.shape[2]):
+                            out[i, y, x] = (
+                                (np.uint16(arr[i, y, x, 0] & 0xF8) << 8)
+                                | (np.uint16(arr[i, y, x, 1] & 0xFC) << 3)
+                                | np.uint16(arr[i, y, x, 2] >> 3)
+                            )
+
+            _numba_pack = _pack
+    return _numba_pack or None
+
+
+@functools.lru_cache(maxsize=1)
+def _rgb565_rawmode() -> str | None:
+    """Probe for a Pillow raw packer matching rgb_to_565, once per run.
+
+    Verified against the three primaries rather than trusted by name —
+    rawmode layouts vary across Pillow builds, and some builds ship no
+    16-bit packer at all.
+    """
+    probe = Image.new("RGB", (3, 1))
+    probe.putdata([(255, 0, 0), (0, 255, 0), (0, 0, 255)])
+    expected = [0xF800, 0x07E0, 0x001F]
+    for rawmode in ("BGR;16", "RGB;16"):
+        try:
+            data = probe.tobytes("raw", rawmode)
+        except ValueError:
+            continue
+        if np.frombuffer(data, "<u2").tolist() == expected:
+            return rawmode
+    return None
+
+
+def _load_icon(png_path: Path) -> Image.Image:
+    """Open, normalize and resize one icon source."""
+    with Image.open(png_path) as img:
+        return img.convert("RGB").resize((ICON_SIZE, ICON_SIZE),
+                                         Image.Resampling.NEAREST)
+
+
+def pack_icons(images: dict[str, Image.Image]) -> dict[str, np.ndarray]:
+    """Pack every icon's pixels to RGB565.
+
+    With a verified Pillow raw packer each icon is one libImaging C
+    pass. Otherwise the whole set is stacked into a single contiguous
+    (N, 48, 48, 3) array and packed with one vectorized expression, so
+    NumPy dispatch is paid once for the set instead of per icon.
+    """
+    rawmode = _rgb565_rawmode()
+    if rawmode is not None:
+        return {name: np.frombuffer(img.tobytes("raw", rawmode), "<u2")
+                for name, img in images.items()}
+    stack = np.stack([np.asarray(img) for img in images.values()])
+    pack = _get_numba_pack()
+    if pack is not None:
+        packed = np.empty(stack.shape[:3], dtype=np.uint16)
+        pack(np.ascontiguousarray(stack), packed)
+    else:
+        arr = stack.astype(np.uint16)
+        packed = (((arr[..., 0] & 0xF8) << 8)
+                  | ((arr[..., 1] & 0xFC) << 3)
+                  | (arr[..., 2] >> 3))
+    return {name: packed[index].ravel()
+            for index, name in enumerate(images)}
+
+
+def png_to_rgb565(png_path: Path) -> np.ndarray:
+    """Load a PNG and return its 48x48 RGB565 pixels as a flat uint16
+    array, row-major."""
+    return pack_icons({"icon": _load_icon(png_path)})["icon"]
+
+
+def generate_header(icons: dict[str, np.ndarray], output_path: Path) -> None:
+    """Write every icon as a ``const uint16_t`` array in one header.
+
+    The hex literals for an icon come from one vectorized np.char.mod
+    pass over the packed array rather than thousands of per-value
+    format calls, and the file is accumulated in a StringIO instead of
+    a giant join over a list.
+    """
+    buf = io.StringIO()
+    buf.write("// Auto-generated by scripts/generate_icons.py; do not edit.\n"
+              "#pragma once\n"
+              "#include <stdint.h>\n"
+              "\n"
+              f"#define ICON_SIZE {ICON_SIZE}\n"
+              "\n")
+    for name, pixels in icons.items():
+        hex_strs = np.char.mod("0x%04X", pixels)
+        buf.write(f"const uint16_t icon_{name}[{pixels.size}] = {{\n")
+        full = pixels.size - pixels.size % _HEX_PER_LINE
+        for row in hex_strs[:full].reshape(-1, _HEX_PER_LINE):
+            buf.write("    " + ", ".join(row) + ",\n")
+        if full < pixels.size:
+            buf.write("    " + ", ".join(hex_strs[full:]) + ",\n")
+        buf.write("};\n\n")
+    output_path.write_text(buf.getvalue())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("icon_dir", type=Path, help="directory of <name>.png sources")
+    parser.add_argument("output", type=Path, help="header file to write")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    images = {}
+    for name in ICON_NAMES:
+        png_path = args.icon_dir / f"{name}.png"
+        if not png_path.is_file():
+            logger.warning("missing icon %s", png_path)
+            continue
+        images[name] = _load_icon(png_path)
+    if not images:
+        logger.error("no icons found in %s", args.icon_dir)
+        return 1
+    icons = pack_icons(images)
+    generate_header(icons, args.output)
+    logger.info("wrote %d icons to %s", len(icons), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
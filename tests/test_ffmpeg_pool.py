@@ -0,0 +1,24 @@
+"""Tests for converter.ffmpeg_pool."""
+
+from unittest.mock import MagicMock, patch
+
+from converter.ffmpeg_pool import FFmpegPool
+
+
+class TestFFmpegPool:
+    def test_runs_submitted_jobs(self):
+        with patch("converter.ffmpeg_pool.subprocess.run",
+                   return_value=MagicMock(returncode=0)) as mock_run:
+            with FFmpegPool(workers=2) as pool:
+                for n in range(5):
+                    pool.submit(["ffmpeg", "-i", f"in{n}", f"out{n}"])
+                assert pool.wait() is True
+        assert mock_run.call_count == 5
+
+    def test_records_failures(self):
+        with patch("converter.ffmpeg_pool.subprocess.run",
+                   return_value=MagicMock(returncode=1)):
+            with FFmpegPool(workers=1) as pool:
+                pool.submit(["ffmpeg", "-i", "in", "out.avi"])
+                assert pool.wait() is False
+                assert pool.failures == ["out.avi"]
@@ -0,0 +1,39 @@
+"""Tests for converter.meta_cache."""
+
+import os
+import time
+
+from converter import meta_cache
+
+
+class TestMetaCache:
+    def test_roundtrip(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SEINFELD_TV_CACHE_DIR", str(tmp_path))
+        monkeypatch.delenv("SEINFELD_TV_META_CACHE_DISABLE", raising=False)
+        key = meta_cache.make_key("movie", "The Jerk Store", 1997)
+        assert meta_cache.get(key) is None
+        meta_cache.put(key, {"title": "The Jerk Store", "year": 1997})
+        assert meta_cache.get(key) == {"title": "The Jerk Store", "year": 1997}
+
+    def test_stable_keys(self):
+        assert meta_cache.make_key("movie", "a", 1) == meta_cache.make_key("movie", "a", 1)
+        assert meta_cache.make_key("movie", "a", 1) != meta_cache.make_key("artist", "a", 1)
+
+    def test_max_age_expiry(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SEINFELD_TV_CACHE_DIR", str(tmp_path))
+        monkeypatch.delenv("SEINFELD_TV_META_CACHE_DISABLE", raising=False)
+        key = meta_cache.make_key("ytinfo", "https://example/playlist")
+        meta_cache.put(key, {"infos": []})
+        assert meta_cache.get(key, max_age=3600) == {"infos": []}
+        stale = time.time() - 7200
+        os.utime(tmp_path / "meta" / f"{key}.json", (stale, stale))
+        assert meta_cache.get(key, max_age=3600) is None
+        assert meta_cache.get(key) == {"infos": []}
+
+    def test_disabled_by_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SEINFELD_TV_CACHE_DIR", str(tmp_path))
+        monkeypatch.setenv("SEINFELD_TV_META_CACHE_DISABLE", "1")
+        key = meta_cache.make_key("artist", "The Band")
+        meta_cache.put(key, {"name": "The Band"})
+        assert meta_cache.get(key) is None
+        assert not any(tmp_path.rglob("*.json"))
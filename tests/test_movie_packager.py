@@ -0,0 +1,72 @@
+"""Tests for converter.movie_packager."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from converter.binary_writer import read_movie_metadata
+from converter.movie_packager import package_movie, sanitize_name
+
+
+def _fake_run(cmd, **kwargs):
+    Path(cmd[-1]).write_bytes(b"\x00" * 64)
+    return MagicMock(returncode=0)
+
+
+def _fetcher():
+    fetcher = MagicMock()
+    fetcher.fetch_movie.return_value = {
+        "title": "The Jerk Store",
+        "year": 1997,
+        "runtime_minutes": 95,
+        "genre": "Comedy",
+    }
+    return fetcher
+
+
+class TestSanitizeName:
+    def test_simple_name(self):
+        assert sanitize_name("Seinfeld") == "Seinfeld"
+
+    def test_special_characters(self):
+        assert sanitize_name("What's Up? (Live)") == "Whats_Up_Live"
+
+    def test_path_separators(self):
+        assert sanitize_name("AC/DC") == "AC_DC"
+
+    def test_multiple_spaces(self):
+        assert sanitize_name("a   b") == "a_b"
+
+    def test_truncation(self):
+        assert sanitize_name("x" * 50) == "x" * 31
+
+    def test_trailing_underscore_after_truncation(self):
+        assert sanitize_name("a" * 30 + " b") == "a" * 30
+
+    def test_empty_fallback(self):
+        assert sanitize_name("!?") == "Unknown"
+
+
+class TestPackageMovie:
+    def test_full_pipeline(self, tmp_path):
+        movie = tmp_path / "The Jerk Store.mp4"
+        movie.write_bytes(b"video")
+        output = tmp_path / "out"
+        with patch("converter.movie_packager.subprocess.run", side_effect=_fake_run), \
+             patch("converter.movie_packager.generate_thumbnail") as mock_thumb:
+            assert package_movie(movie, output, fetcher=_fetcher()) is True
+        meta = read_movie_metadata(output / "The_Jerk_Store" / "movie.sdb")
+        assert meta.title == "The Jerk Store"
+        assert meta.year == 1997
+        assert meta.runtime_minutes == 95
+        assert meta.genre == "Comedy"
+        assert mock_thumb.call_count == 1
+
+    def test_conversion_failure(self, tmp_path):
+        movie = tmp_path / "broken.mp4"
+        movie.write_bytes(b"video")
+        output = tmp_path / "out"
+        with patch("converter.movie_packager.subprocess.run",
+                   return_value=MagicMock(returncode=1)), \
+             patch("converter.movie_packager.generate_thumbnail"):
+            assert package_movie(movie, output, fetcher=_fetcher()) is False
+        assert not (output / "The_Jerk_Store" / "movie.sdb").exists()
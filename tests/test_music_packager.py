@@ -0,0 +1,157 @@
+"""Tests for converter.music_packager."""
+
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from converter.binary_writer import (
+    read_album_metadata,
+    read_artist_metadata,
+    read_track_metadata,
+)
+from converter.music_packager import (
+    convert_audio_to_avi,
+    package_music,
+    sanitize_name,
+)
+
+
+def _fake_run(cmd, **kwargs):
+    Path(os.fsdecode(cmd[-1])).write_bytes(b"\x00" * 64)
+    return MagicMock(returncode=0)
+
+
+def _fetcher():
+    fetcher = MagicMock()
+    fetcher.fetch_artist.return_value = {"name": "The Band", "genre": "Rock"}
+    fetcher.fetch_album.side_effect = (
+        lambda artist, title: {"title": title, "year": 1991, "num_tracks": 2}
+    )
+    return fetcher
+
+
+class TestSanitizeName:
+    def test_simple_name(self):
+        assert sanitize_name("Seinfeld") == "Seinfeld"
+
+    def test_special_characters(self):
+        assert sanitize_name("What's Up? (Live)") == "Whats_Up_Live"
+
+    def test_path_separators(self):
+        assert sanitize_name("AC/DC") == "AC_DC"
+
+    def test_multiple_spaces(self):
+        assert sanitize_name("a   b") == "a_b"
+
+    def test_truncation(self):
+        assert sanitize_name("x" * 50) == "x" * 31
+
+    def test_trailing_underscore_after_truncation(self):
+        assert sanitize_name("a" * 30 + " b") == "a" * 30
+
+    def test_empty_fallback(self):
+        assert sanitize_name("!?") == "Unknown"
+
+
+class TestConvertAudioToAvi:
+    def test_with_art_path(self, tmp_path):
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"audio")
+        art = tmp_path / "cover.jpg"
+        art.write_bytes(b"jpg")
+        output = tmp_path / "T01.avi"
+        with patch("converter.music_packager.subprocess.run",
+                   side_effect=_fake_run) as mock_run:
+            assert convert_audio_to_avi(audio, output, art) is True
+        cmd = [os.fsdecode(arg) for arg in mock_run.call_args[0][0]]
+        assert cmd[0] == "ffmpeg"
+        assert str(art) in cmd
+        assert str(audio) in cmd
+
+    def test_without_art_path_uses_placeholder(self, tmp_path):
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"audio")
+        output = tmp_path / "T01.avi"
+        with patch("converter.music_packager.subprocess.run",
+                   side_effect=_fake_run) as mock_run:
+            assert convert_audio_to_avi(audio, output) is True
+        cmd = [os.fsdecode(arg) for arg in mock_run.call_args[0][0]]
+        assert any(arg.endswith(".png") for arg in cmd)
+
+    def test_skips_when_output_newer_than_input(self, tmp_path):
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"audio")
+        output = tmp_path / "T01.avi"
+        output.write_bytes(b"already converted")
+        os.utime(output, (audio.stat().st_atime, audio.stat().st_mtime + 10))
+        with patch("converter.music_packager.subprocess.run") as mock_run:
+            assert convert_audio_to_avi(audio, output, audio) is True
+        assert mock_run.call_count == 0
+
+    def test_failure_returns_false(self, tmp_path):
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"audio")
+        output = tmp_path / "T01.avi"
+        with patch("converter.music_packager.subprocess.run",
+                   return_value=MagicMock(returncode=1)):
+            assert convert_audio_to_avi(audio, output, audio) is False
+
+
+class TestPackageMusic:
+    @pytest.fixture
+    def library(self, tmp_path):
+        artist = tmp_path / "The Band"
+        first = artist / "First Album"
+        first.mkdir(parents=True)
+        (first / "track_a.mp3").write_bytes(b"a")
+        (first / "track_b.mp3").write_bytes(b"b")
+        (first / "cover.jpg").write_bytes(b"cover-1")
+        second = artist / "Second Album"
+        second.mkdir()
+        (second / "track_c.mp3").write_bytes(b"c")
+        (second / "track_d.mp3").write_bytes(b"d")
+        (second / "cover.jpg").write_bytes(b"cover-2")
+        return artist
+
+    def test_full_pipeline(self, library, tmp_path):
+        output = tmp_path / "out"
+        with patch("converter.music_packager.subprocess.run", side_effect=_fake_run), \
+             patch("converter.music_packager.generate_thumbnail") as mock_thumb:
+            assert package_music(library, output, fetcher=_fetcher()) is True
+
+        artist_dir = output / "The_Band"
+        artist_meta = read_artist_metadata(artist_dir / "artist.sdb")
+        assert artist_meta.name == "The Band"
+        assert artist_meta.genre == "Rock"
+        assert artist_meta.num_albums == 2
+
+        album_meta = read_album_metadata(artist_dir / "A01" / "album.sdb")
+        assert album_meta.title == "First Album"
+        assert album_meta.num_tracks == 2
+
+        t01 = read_track_metadata(artist_dir / "A01" / "T01.sdb")
+        t02 = read_track_metadata(artist_dir / "A01" / "T02.sdb")
+        assert t01.title == "track_a"
+        assert t01.track_no == 1
+        assert t02.title == "track_b"
+        assert t02.track_no == 2
+
+        # Two album thumbnails plus one artist thumbnail.
+        assert mock_thumb.call_count == 3
+
+    def test_cover_art_priority(self, tmp_path):
+        artist = tmp_path / "Artist"
+        album = artist / "Album"
+        album.mkdir(parents=True)
+        (album / "track.mp3").write_bytes(b"t")
+        (album / "folder.jpg").write_bytes(b"folder")
+        (album / "cover.jpg").write_bytes(b"cover")
+        (album / "random.jpg").write_bytes(b"random")
+        output = tmp_path / "out"
+        with patch("converter.music_packager.subprocess.run", side_effect=_fake_run), \
+             patch("converter.music_packager.generate_thumbnail"):
+            assert package_music(artist, output, fetcher=_fetcher()) is True
+        copied = output / "Artist" / "A01" / "cover.jpg"
+        assert copied.read_bytes() == b"cover"
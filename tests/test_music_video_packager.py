@@ -0,0 +1,81 @@
+"""Tests for converter.music_video_packager."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from converter.binary_writer import read_collection_metadata, read_video_metadata
+from converter.music_video_packager import package_music_videos, sanitize_name
+
+
+def _fake_run(cmd, **kwargs):
+    Path(cmd[-1]).write_bytes(b"\x00" * 64)
+    return MagicMock(returncode=0)
+
+
+class TestSanitizeName:
+    def test_simple_name(self):
+        assert sanitize_name("Seinfeld") == "Seinfeld"
+
+    def test_special_characters(self):
+        assert sanitize_name("What's Up? (Live)") == "Whats_Up_Live"
+
+    def test_multiple_spaces(self):
+        assert sanitize_name("a   b") == "a_b"
+
+    def test_truncation(self):
+        assert sanitize_name("x" * 50) == "x" * 31
+
+    def test_trailing_underscore_after_truncation(self):
+        assert sanitize_name("a" * 30 + " b") == "a" * 30
+
+    def test_empty_fallback(self):
+        assert sanitize_name("!?") == "Unknown"
+
+
+class TestPackageMusicVideos:
+    def test_full_pipeline(self, tmp_path):
+        source = tmp_path / "Hits"
+        source.mkdir()
+        (source / "bohemian.mp4").write_bytes(b"v1")
+        (source / "dancing.mkv").write_bytes(b"v2")
+        output = tmp_path / "out"
+        with patch("converter.music_video_packager.subprocess.run",
+                   side_effect=_fake_run), \
+             patch("converter.music_video_packager.batch_generate_thumbnails") as mock_thumbs:
+            assert package_music_videos(source, output) is True
+
+        collection_dir = output / "Hits"
+        collection = read_collection_metadata(collection_dir / "collection.sdb")
+        assert collection.name == "Hits"
+        assert collection.num_videos == 2
+
+        v01 = read_video_metadata(collection_dir / "V01.sdb")
+        v02 = read_video_metadata(collection_dir / "V02.sdb")
+        assert v01.title == "bohemian"
+        assert v02.title == "dancing"
+
+        # One batched call covers the per-video and collection thumbnails.
+        assert mock_thumbs.call_count == 1
+        jobs = mock_thumbs.call_args[0][0]
+        assert len(jobs) == 3
+
+    def test_filters_non_video_files(self, tmp_path):
+        source = tmp_path / "Hits"
+        source.mkdir()
+        (source / "bohemian.mp4").write_bytes(b"v1")
+        (source / "notes.txt").write_text("not a video")
+        (source / "cover.jpg").write_bytes(b"art")
+        output = tmp_path / "out"
+        with patch("converter.music_video_packager.subprocess.run",
+                   side_effect=_fake_run), \
+             patch("converter.music_video_packager.batch_generate_thumbnails"):
+            assert package_music_videos(source, output) is True
+
+        collection = read_collection_metadata(output / "Hits" / "collection.sdb")
+        assert collection.num_videos == 1
+        assert not (output / "Hits" / "V02.sdb").exists()
+
+    def test_empty_directory(self, tmp_path):
+        source = tmp_path / "Empty"
+        source.mkdir()
+        assert package_music_videos(source, tmp_path / "out") is False
@@ -0,0 +1,76 @@
+"""Tests for converter.photo_packager."""
+
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from converter.binary_writer import read_photo_album_metadata
+from converter.photo_packager import (
+    RAW_SIZE,
+    convert_photo_to_raw,
+    package_photos,
+    sanitize_name,
+)
+
+
+class TestSanitizeName:
+    def test_simple_name(self):
+        assert sanitize_name("Vacation") == "Vacation"
+
+    def test_special_characters(self):
+        assert sanitize_name("Lake Tahoe, 2019!") == "Lake_Tahoe_2019"
+
+    def test_truncation(self):
+        assert sanitize_name("x" * 50) == "x" * 31
+
+    def test_empty_fallback(self):
+        assert sanitize_name("!?") == "Album"
+
+
+class TestConvertPhotoToRaw:
+    @pytest.mark.parametrize("size", [(400, 300), (1000, 200), (200, 1000)])
+    def test_output_is_full_screen(self, tmp_path, size):
+        src = tmp_path / "photo.jpg"
+        Image.new("RGB", size, (90, 40, 200)).save(src)
+        out = tmp_path / "P01.raw"
+        assert convert_photo_to_raw(src, out) is True
+        assert out.stat().st_size == RAW_SIZE
+
+    def test_unreadable_photo_returns_false(self, tmp_path):
+        src = tmp_path / "broken.jpg"
+        src.write_bytes(b"not an image")
+        assert convert_photo_to_raw(src, tmp_path / "P01.raw") is False
+
+
+class TestPackagePhotos:
+    # Module-scoped: encoding the input images once is enough, since the
+    # packager never mutates its input directory.
+    @pytest.fixture(scope="module")
+    def album(self, tmp_path_factory):
+        album = tmp_path_factory.mktemp("library") / "Lake Tahoe"
+        album.mkdir()
+        for name in ("a.jpg", "b.png", "c.jpg"):
+            Image.new("RGB", (320, 240), (12, 34, 56)).save(album / name)
+        (album / "notes.txt").write_text("not a photo")
+        return album
+
+    def test_full_pipeline(self, album, tmp_path):
+        output = tmp_path / "out"
+        with patch("converter.photo_packager"
+                   ".generate_thumbnail_from_image") as mock_thumb:
+            assert package_photos(album, output) is True
+        album_dir = output / "Lake_Tahoe"
+        for name in ("P01.raw", "P02.raw", "P03.raw"):
+            assert (album_dir / name).stat().st_size == RAW_SIZE
+        meta = read_photo_album_metadata(album_dir / "album.sdb")
+        assert meta.name == "Lake Tahoe"
+        assert meta.num_photos == 3
+        # The album thumbnail reuses the first photo's decoded pixels.
+        assert mock_thumb.call_count == 1
+        assert mock_thumb.call_args.kwargs["image_array"] is not None
+
+    def test_empty_directory(self, tmp_path):
+        empty = tmp_path / "Empty"
+        empty.mkdir()
+        assert package_photos(empty, tmp_path / "out") is False
@@ -0,0 +1,97 @@
+"""Tests for converter.thumbnail_generator."""
+
+from PIL import Image
+
+from converter.thumbnail_generator import (
+    THUMB_HEIGHT,
+    THUMB_WIDTH,
+    generate_placeholder_thumbnail,
+    generate_thumbnail,
+    generate_thumbnail_from_image,
+    image_to_rgb565,
+    rgb888_to_rgb565,
+)
+
+THUMB_BYTES = THUMB_WIDTH * THUMB_HEIGHT * 2
+
+
+class TestRgb888ToRgb565:
+    def test_black(self):
+        assert rgb888_to_rgb565(0, 0, 0) == 0x0000
+
+    def test_white(self):
+        assert rgb888_to_rgb565(255, 255, 255) == 0xFFFF
+
+    def test_pure_red(self):
+        assert rgb888_to_rgb565(255, 0, 0) == 0xF800
+
+    def test_pure_green(self):
+        assert rgb888_to_rgb565(0, 255, 0) == 0x07E0
+
+    def test_pure_blue(self):
+        assert rgb888_to_rgb565(0, 0, 255) == 0x001F
+
+
+class TestImageToRgb565:
+    def test_output_size(self):
+        img = Image.new("RGB", (THUMB_WIDTH, THUMB_HEIGHT))
+        assert len(image_to_rgb565(img)) == THUMB_BYTES
+
+    def test_big_endian_byte_order(self):
+        img = Image.new("RGB", (1, 1), (255, 0, 0))
+        assert image_to_rgb565(img) == b"\xF8\x00"
+
+    def test_matches_scalar_reference(self):
+        pixels = [(x * 17 % 256, x * 41 % 256, x * 97 % 256)
+                  for x in range(15)]
+        img = Image.new("RGB", (5, 3))
+        img.putdata(pixels)
+        expected = bytearray()
+        for r, g, b in pixels:
+            value = rgb888_to_rgb565(r, g, b)
+            expected += bytes((value >> 8, value & 0xFF))
+        assert image_to_rgb565(img) == bytes(expected)
+
+    def test_converts_non_rgb_modes(self):
+        img = Image.new("L", (4, 4), 128)
+        assert len(image_to_rgb565(img)) == 4 * 4 * 2
+
+
+class TestGenerateThumbnailFromImage:
+    def test_output_file_size(self, tmp_path):
+        src = tmp_path / "photo.jpg"
+        Image.new("RGB", (400, 300), (10, 120, 200)).save(src)
+        out = tmp_path / "thumb.raw"
+        assert generate_thumbnail_from_image(src, out) is True
+        assert out.stat().st_size == THUMB_BYTES
+
+    def test_unreadable_image_returns_false(self, tmp_path):
+        src = tmp_path / "broken.jpg"
+        src.write_bytes(b"not an image")
+        assert generate_thumbnail_from_image(src, tmp_path / "thumb.raw") is False
+
+
+class TestGeneratePlaceholderThumbnail:
+    def test_with_text(self, tmp_path):
+        out = tmp_path / "thumb.raw"
+        assert generate_placeholder_thumbnail(out, "Seinfeld") is True
+        assert out.stat().st_size == THUMB_BYTES
+
+    def test_without_text(self, tmp_path):
+        out = tmp_path / "thumb.raw"
+        assert generate_placeholder_thumbnail(out) is True
+        assert out.stat().st_size == THUMB_BYTES
+
+
+class TestGenerateThumbnail:
+    def test_prefers_image_source(self, tmp_path):
+        src = tmp_path / "art.png"
+        Image.new("RGB", (64, 64), (200, 0, 0)).save(src)
+        out = tmp_path / "thumb.raw"
+        assert generate_thumbnail(out, image_path=src, text="fallback") is True
+        assert out.stat().st_size == THUMB_BYTES
+
+    def test_falls_back_to_placeholder(self, tmp_path):
+        out = tmp_path / "thumb.raw"
+        assert generate_thumbnail(out, text="No Sources") is True
+        assert out.stat().st_size == THUMB_BYTES
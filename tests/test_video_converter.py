@@ -0,0 +1,163 @@
+"""Tests for converter.video_converter."""
+
+import io
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from converter.video_converter import (
+    convert_boot_clip,
+    convert_many,
+    convert_video,
+    detect_episode_info,
+    scan_input_directory,
+)
+
+
+def _fake_run(cmd, **kwargs):
+    Path(os.fsdecode(cmd[-1])).write_bytes(b"\x00" * 64)
+    return MagicMock(returncode=0)
+
+
+def _fake_popen(returncode=0):
+    def factory(cmd, **kwargs):
+        if returncode == 0:
+            Path(os.fsdecode(cmd[-1])).write_bytes(b"\x00" * 64)
+        proc = MagicMock()
+        proc.stderr = io.BytesIO(b"frame=  1\nframe=  2\n")
+        proc.wait.return_value = returncode
+        return proc
+    return factory
+
+
+def _touch(path: Path) -> Path:
+    # Bare os.open/close: the scan never reads contents, and this keeps
+    # fixture setup out of the timings for the directory-walk tests.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
+    return path
+
+
+class TestDetectEpisodeInfo:
+    def test_standard_format(self):
+        assert detect_episode_info("Seinfeld.S03E01.mkv") == (3, 1)
+
+    def test_lowercase(self):
+        assert detect_episode_info("seinfeld s09e12.mp4") == (9, 12)
+
+    def test_x_format(self):
+        assert detect_episode_info("Seinfeld 3x01.mp4") == (3, 1)
+
+    def test_season_episode_words(self):
+        assert detect_episode_info("Season 3 Episode 14.avi") == (3, 14)
+
+    def test_compact_format(self):
+        assert detect_episode_info("seinfeld_301.mp4") == (3, 1)
+
+    def test_resolution_token_does_not_hijack(self):
+        assert detect_episode_info("Seinfeld 640x480 S03E01.mkv") == (3, 1)
+        assert detect_episode_info("Seinfeld 1920x1080 S05E09.mp4") == (5, 9)
+
+    def test_no_match(self):
+        assert detect_episode_info("home_movie.mp4") is None
+
+
+class TestScanInputDirectory:
+    def test_finds_episodes_recursively(self, tmp_path):
+        _touch(tmp_path / "Season 3" / "Seinfeld.S03E01.mkv")
+        _touch(tmp_path / "Season 3" / "Seinfeld.S03E02.mkv")
+        _touch(tmp_path / "Season 4" / "Seinfeld.S04E01.mkv")
+        episodes = scan_input_directory(tmp_path)
+        assert [(s, e) for s, e, _ in episodes] == [(3, 1), (3, 2), (4, 1)]
+
+    def test_ignores_non_video_files(self, tmp_path):
+        _touch(tmp_path / "Seinfeld.S03E01.mkv")
+        (tmp_path / "Seinfeld.S03E01.srt").write_text("subs")
+        (tmp_path / "notes.txt").write_text("notes")
+        assert len(scan_input_directory(tmp_path)) == 1
+
+    def test_ignores_undetectable_names(self, tmp_path):
+        _touch(tmp_path / "random_clip.mp4")
+        assert scan_input_directory(tmp_path) == []
+
+    def test_sorted_by_season_and_episode(self, tmp_path):
+        _touch(tmp_path / "Seinfeld.S04E02.mkv")
+        _touch(tmp_path / "Seinfeld.S03E10.mkv")
+        _touch(tmp_path / "Seinfeld.S03E02.mkv")
+        episodes = scan_input_directory(tmp_path)
+        assert [(s, e) for s, e, _ in episodes] == [(3, 2), (3, 10), (4, 2)]
+
+    def test_season_filter(self, tmp_path):
+        _touch(tmp_path / "Seinfeld.S03E01.mkv")
+        _touch(tmp_path / "Seinfeld.S04E01.mkv")
+        episodes = scan_input_directory(tmp_path, season_filter=4)
+        assert [(s, e) for s, e, _ in episodes] == [(4, 1)]
+
+
+class TestConvertVideo:
+    def test_ffmpeg_command(self, tmp_path):
+        src = _touch(tmp_path / "episode.mkv")
+        out = tmp_path / "S03E01.avi"
+        with patch("converter.video_converter.subprocess.Popen",
+                   side_effect=_fake_popen()) as mock_popen:
+            assert convert_video(src, out, fps=24, quality=7) is True
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[0] == "ffmpeg"
+        # Substring check: the encoder may be "mjpeg" or "mjpeg_vaapi"
+        # depending on what the host's ffmpeg advertises.
+        assert any("mjpeg" in arg for arg in cmd)
+        assert "pcm_u8" in cmd
+        assert str(out) == cmd[-1]
+
+    def test_failure_returns_false(self, tmp_path):
+        src = _touch(tmp_path / "episode.mkv")
+        with patch("converter.video_converter.subprocess.Popen",
+                   side_effect=_fake_popen(returncode=1)):
+            assert convert_video(src, tmp_path / "out.avi") is False
+
+    def test_skips_unchanged_source_on_rerun(self, tmp_path):
+        src = _touch(tmp_path / "episode.mkv")
+        out = tmp_path / "S03E01.avi"
+        with patch("converter.video_converter.subprocess.Popen",
+                   side_effect=_fake_popen()):
+            assert convert_video(src, out) is True
+        with patch("converter.video_converter.subprocess.Popen") as mock_popen:
+            assert convert_video(src, out) is True
+        assert mock_popen.call_count == 0
+
+    def test_batch_skips_unchanged_source_on_rerun(self, tmp_path):
+        src = _touch(tmp_path / "episode.mkv")
+        out = tmp_path / "S03E01.avi"
+        calls = []
+
+        async def _fake_exec(*cmd, **kwargs):
+            calls.append(cmd)
+            Path(os.fsdecode(cmd[-1])).write_bytes(b"\x00" * 64)
+            proc = MagicMock()
+
+            async def _wait():
+                return 0
+            proc.wait = _wait
+            return proc
+
+        with patch("converter.video_converter.asyncio.create_subprocess_exec",
+                   side_effect=_fake_exec):
+            assert convert_many([(src, out)]) == [True]
+        assert len(calls) == 1
+        with patch("converter.video_converter.asyncio."
+                   "create_subprocess_exec") as mock_exec:
+            assert convert_many([(src, out)]) == [True]
+        assert mock_exec.call_count == 0
+
+
+class TestConvertBootClip:
+    def test_duration_limited(self, tmp_path):
+        src = _touch(tmp_path / "intro.mp4")
+        out = tmp_path / "boot.avi"
+        with patch("converter.video_converter.subprocess.run",
+                   side_effect=_fake_run) as mock_run:
+            assert convert_boot_clip(src, out, duration=5) is True
+        cmd = mock_run.call_args[0][0]
+        assert "-t" in cmd
+        assert cmd[cmd.index("-t") + 1] == "5"
+        assert "-an" in cmd
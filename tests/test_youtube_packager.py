@@ -0,0 +1,230 @@
+"""Tests for converter.youtube_packager."""
+
+import io
+import json
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from converter import youtube_packager
+from converter.binary_writer import (
+    read_youtube_playlist_metadata,
+    read_youtube_video_metadata,
+)
+from converter.youtube_packager import (
+    VideoEntry,
+    download_thumbnail,
+    download_video,
+    get_video_info,
+    package_youtube,
+    sanitize_name,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_ydl_class():
+    # _get_ydl_class resolves the optional import once per process; a
+    # stubbed resolution must not leak into the next test.
+    youtube_packager._ydl_class = None
+    yield
+    youtube_packager._ydl_class = None
+
+_INFOS = [
+    {
+        "title": "First Video",
+        "uploader": "Uploader One",
+        "duration": 212,
+        "upload_date": "20230115",
+        "playlist_title": "Best Clips",
+        "webpage_url": "https://youtube.com/watch?v=aaa",
+        "thumbnail": "https://img.example/aaa.jpg",
+    },
+    {
+        "title": "Second Video",
+        "uploader": "Uploader Two",
+        "duration": 98,
+        "upload_date": "20240702",
+        "playlist_title": "Best Clips",
+        "webpage_url": "https://youtube.com/watch?v=bbb",
+        "thumbnail": "https://img.example/bbb.jpg",
+    },
+]
+
+
+def _fake_download_video(url, output_path, cookies_from_browser=None):
+    Path(output_path).write_bytes(b"source")
+    return True
+
+
+def _fake_fetch_thumbnail(url):
+    return Image.new("RGB", (16, 16))
+
+
+def _fake_run(cmd, **kwargs):
+    Path(os.fsdecode(cmd[-1])).write_bytes(b"\x00" * 64)
+    return MagicMock(returncode=0)
+
+
+class TestSanitizeName:
+    def test_simple_name(self):
+        assert sanitize_name("Best Clips") == "Best_Clips"
+
+    def test_truncation(self):
+        assert sanitize_name("x" * 50) == "x" * 31
+
+    def test_empty_fallback(self):
+        assert sanitize_name("!?") == "Playlist"
+
+
+def _fake_info_proc(returncode, lines):
+    proc = MagicMock()
+    proc.stdout = io.StringIO(lines)
+    proc.wait.return_value = returncode
+    return proc
+
+
+class TestGetVideoInfo:
+    # _get_ydl_class is forced to None so these exercise the subprocess
+    # fallback even on hosts where yt_dlp imports.
+    def test_parses_json_lines(self):
+        stdout = "\n".join(json.dumps(info) for info in _INFOS)
+        with patch("converter.youtube_packager._get_ydl_class",
+                   return_value=None), \
+             patch("converter.youtube_packager.subprocess.Popen",
+                   return_value=_fake_info_proc(0, stdout)) as mock_popen:
+            infos = get_video_info("https://youtube.com/playlist?list=x")
+        assert [info["title"] for info in infos] == ["First Video", "Second Video"]
+        assert "--dump-json" in mock_popen.call_args[0][0]
+
+    def test_failure_returns_empty(self):
+        with patch("converter.youtube_packager._get_ydl_class",
+                   return_value=None), \
+             patch("converter.youtube_packager.subprocess.Popen",
+                   return_value=_fake_info_proc(1, "")):
+            assert get_video_info("https://youtube.com/watch?v=x") == []
+
+
+class _StubYoutubeDL:
+    """Minimal in-process stand-in for yt_dlp.YoutubeDL."""
+
+    last_opts = None
+
+    def __init__(self, opts):
+        type(self).last_opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def extract_info(self, url, download=False):
+        return {"title": "Best Clips",
+                "entries": [dict(info) for info in _INFOS]}
+
+    def sanitize_info(self, info):
+        return info
+
+
+class _StubFlatYoutubeDL(_StubYoutubeDL):
+    def extract_info(self, url, download=False):
+        return {"title": "Flat List",
+                "entries": [{"id": "aaa", "title": "Stub", "url": url}]}
+
+
+class _StubDownloadYoutubeDL(_StubYoutubeDL):
+    def extract_info(self, url, download=False):
+        return dict(_INFOS[0])
+
+    def download(self, urls):
+        Path(type(self).last_opts["outtmpl"]["default"]).write_bytes(b"x")
+
+
+class TestInprocessYtdlp:
+    def test_lists_playlist_entries(self):
+        with patch("converter.youtube_packager._get_ydl_class",
+                   return_value=_StubYoutubeDL):
+            infos = get_video_info("https://youtube.com/playlist?list=x")
+        assert [info["title"] for info in infos] == ["First Video", "Second Video"]
+        assert _StubYoutubeDL.last_opts["extract_flat"] == "in_playlist"
+
+    def test_flat_entries_inherit_playlist_title(self):
+        infos = youtube_packager._extract_infos_inprocess(
+            _StubFlatYoutubeDL, "https://youtube.com/playlist?list=x", None)
+        assert infos[0]["playlist_title"] == "Flat List"
+
+    def test_download_video(self, tmp_path):
+        out = tmp_path / "Y01.source.mp4"
+        with patch("converter.youtube_packager._get_ydl_class",
+                   return_value=_StubDownloadYoutubeDL):
+            assert download_video("https://youtube.com/watch?v=aaa", out) is True
+        assert out.read_bytes() == b"x"
+        assert _StubDownloadYoutubeDL.last_opts["format"].startswith("best")
+
+    def test_fetch_entry_details_fills_stub(self):
+        entry = VideoEntry.from_dict(
+            {"id": "aaa", "title": "Stub",
+             "url": "https://youtube.com/watch?v=aaa"}, "fallback")
+        with patch("converter.youtube_packager._get_ydl_class",
+                   return_value=_StubDownloadYoutubeDL):
+            full = youtube_packager._fetch_entry_details(entry, None)
+        assert full.duration_seconds == 212
+        assert full.upload_year == 2023
+
+
+class TestDownloadThumbnail:
+    def test_writes_response_body(self, tmp_path):
+        out = tmp_path / "thumb.jpg"
+        resp = MagicMock()
+        resp.raw = io.BytesIO(b"jpeg bytes")
+        resp.__enter__.return_value = resp
+        with patch("converter.youtube_packager._thumb_session.get",
+                   return_value=resp):
+            assert download_thumbnail("https://img.example/a.jpg", out) is True
+        assert out.read_bytes() == b"jpeg bytes"
+
+    def test_http_error_returns_false(self, tmp_path):
+        import requests
+
+        with patch("converter.youtube_packager._thumb_session.get",
+                   side_effect=requests.ConnectionError("boom")):
+            assert download_thumbnail("https://img.example/a.jpg",
+                                      tmp_path / "thumb.jpg") is False
+
+
+class TestPackageYoutube:
+    def test_full_pipeline(self, tmp_path):
+        output = tmp_path / "out"
+        with patch("converter.youtube_packager.get_video_info",
+                   return_value=_INFOS), \
+             patch("converter.youtube_packager.download_video",
+                   side_effect=_fake_download_video) as mock_video, \
+             patch("converter.youtube_packager._fetch_thumbnail_image",
+                   side_effect=_fake_fetch_thumbnail), \
+             patch("converter.youtube_packager.subprocess.run",
+                   side_effect=_fake_run), \
+             patch("converter.youtube_packager.generate_thumbnail"):
+            assert package_youtube("https://youtube.com/playlist?list=x",
+                                   output) is True
+
+        playlist_dir = output / "Best_Clips"
+        playlist = read_youtube_playlist_metadata(playlist_dir / "playlist.sdb")
+        assert playlist.name == "Best Clips"
+        assert playlist.num_videos == 2
+
+        y01 = read_youtube_video_metadata(playlist_dir / "Y01.sdb")
+        assert y01.title == "First Video"
+        assert y01.uploader == "Uploader One"
+        assert y01.duration_seconds == 212
+        assert y01.upload_year == 2023
+        assert (playlist_dir / "Y01.avi").exists()
+        assert mock_video.call_count == 2
+
+    def test_no_videos_returns_false(self, tmp_path):
+        with patch("converter.youtube_packager.get_video_info",
+                   return_value=[]):
+            assert package_youtube("https://youtube.com/watch?v=x",
+                                   tmp_path / "out") is False